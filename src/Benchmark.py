@@ -0,0 +1,306 @@
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from GraphAlgo import GraphAlgo
+import PointSearch
+import GraphGenerator
+
+try:
+    import networkx as nx
+except ImportError:
+    nx = None
+
+"""A benchmark harness for GraphAlgo: load/save, shortest path, connected components and mutation workloads
+   over the data files and synthetic scale ups. every case is warmed up, repeated, summarized by percentiles
+   and its results are checked against networkx (when installed) outside the timed runs.
+   the results are written as json so a later run can be compared with them to catch regressions.
+
+   usage, from src: python Benchmark.py [--quick] [--output results.json] [--baseline old.json]"""
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data")
+DATA_FILES = ["A0", "A1", "A2", "A3", "A4", "A5", "G_10_80_0.json", "G_100_800_0.json", "G_1000_8000_0.json",
+              "G_1000_8000_1.json", "G_10000_80000_0.json"]
+QUICK_FILES = ["A5", "G_1000_8000_1.json"]
+
+
+"""Return the q-th percentile of the values, interpolating between the closest ranks
+   @param q: a number between 0 and 100"""
+
+
+def percentile(values, q: float) -> float:
+    ordered = sorted(values)
+    place = (len(ordered) - 1) * q / 100
+    low = math.floor(place)
+    high = math.ceil(place)
+    return ordered[low] + (ordered[high] - ordered[low]) * (place - low)
+
+
+"""Time a function, after a few untimed warmup calls
+   @param func: a function with no arguments
+   @return a dictionary {runs, min, median, p90, max, mean} in seconds"""
+
+
+def measure(func, warmup: int = 1, repeats: int = 5) -> dict:
+    for i in range(warmup):
+        func()
+    runs = list()
+    for i in range(repeats):
+        start = time.perf_counter()
+        func()
+        runs.append(time.perf_counter() - start)
+    return {"runs": runs, "min": min(runs), "median": percentile(runs, 50), "p90": percentile(runs, 90),
+            "max": max(runs), "mean": sum(runs) / len(runs)}
+
+
+"""Copy a graph to a networkx DiGraph
+   @param graph: any GraphInterface"""
+
+
+def to_networkx(graph):
+    nxg = nx.DiGraph()
+    nxg.add_nodes_from(graph.get_all_v())
+    for n in graph.get_all_v():
+        for e, w in graph.all_out_edges_of_node(n).items():
+            nxg.add_edge(n, e, weight=w)
+    return nxg
+
+
+class Benchmark:
+    """Create a harness
+       @param warmup: the untimed calls before every case
+       @param repeats: the timed calls of every case
+       @param check: compare the results with networkx, when it is installed
+       @param seed: the seed of the random queries and changes"""
+
+    def __init__(self, warmup: int = 1, repeats: int = 5, check: bool = True, seed: int = 1):
+        self.warmup = warmup
+        self.repeats = repeats
+        self.check = check and nx is not None
+        self.seed = seed
+        self.results = list()
+
+    """Time one case and keep its summary
+       @param workload: the workload's name, e.g. "shortest_path"
+       @param file: the graph file's name
+       @param variant: what is compared inside the workload, e.g. the method
+       @param ok: the result of the networkx check, None if it wasn't checked
+       @param count: the number of operations in one call, the summary gets the time per operation too
+       @return the summary dictionary"""
+
+    def run(self, workload: str, file: str, variant: str, func, ok=None, count: int = 1) -> dict:
+        result = {"workload": workload, "file": os.path.basename(file), "variant": variant, "count": count,
+                  "ok": ok}
+        result.update(measure(func, self.warmup, self.repeats))
+        result["per_op"] = result["median"] / count
+        self.results.append(result)
+        print("%-14s %-22s %-24s median %.6f p90 %.6f per op %.6f%s" % (
+            workload, result["file"], variant, result["median"], result["p90"], result["per_op"],
+            "" if ok is None else " ok" if ok else " MISMATCH"))
+        return result
+
+    """Run every workload on a graph file"""
+
+    def run_file(self, file: str, queries: int = 20):
+        ga = GraphAlgo(cache_size=0)
+        ga.load_from_json(file)
+        nxg = to_networkx(ga.get_graph()) if self.check else None
+        self.load_save(file)
+        self.shortest_paths(file, ga, nxg, queries)
+        self.components(file, ga, nxg)
+        self.mutations(file, nxg, queries)
+
+    def load_save(self, file: str):
+        with tempfile.TemporaryDirectory() as tmp:
+            self.run("load", file, "json", lambda: GraphAlgo().load_from_json(file))
+            ga = GraphAlgo()
+            ga.load_from_json(file)
+            out = os.path.join(tmp, "out.json")
+            self.run("save", file, "json", lambda: ga.save_to_json(out))
+            self.run("save", file, "json gzip", lambda: ga.save_to_json(out + ".gz"))
+            self.run("save", file, "binary", lambda: ga.save_binary(out + ".bin"))
+            self.run("load", file, "binary mmap", lambda: GraphAlgo().load_binary(out + ".bin"))
+
+    def shortest_paths(self, file: str, ga: GraphAlgo, nxg, queries: int):
+        keys = list(ga.get_graph().get_all_v())
+        rand = random.Random(self.seed)
+        pairs = [(rand.choice(keys), rand.choice(keys)) for i in range(queries)]
+        expected = None
+        if nxg is not None:
+            expected = [self._nx_distance(nxg, id1, id2) for id1, id2 in pairs]
+
+        methods = ["dijkstra", "bidirectional", "alt"]
+        if PointSearch.min_weight_ratio(ga.get_graph()) is not None:
+            methods.append("astar")
+        for method in methods:
+            if method == "alt":
+                ga.preprocess_landmarks()
+            ok = None
+            if expected is not None:
+                got = [ga.shortest_path(id1, id2, method)[0] for id1, id2 in pairs]
+                ok = all(math.isclose(a, b) for a, b in zip(got, expected))
+            self.run("shortest_path", file, method,
+                     lambda: [ga.shortest_path(id1, id2, method) for id1, id2 in pairs], ok, len(pairs))
+
+        sources = [id1 for id1, id2 in pairs[:5]]
+        ok = None
+        if nxg is not None:
+            matrix = ga.distance_matrix(sources, keys, workers=1)
+            ok = True
+            for row, src in zip(matrix, sources):
+                expected = nx.single_source_dijkstra_path_length(nxg, src)
+                ok = ok and all(math.isclose(d, expected.get(k, float('inf'))) for d, k in zip(row, keys))
+        self.run("distance_matrix", file, "python", lambda: ga.distance_matrix(sources, workers=1), ok, len(sources))
+
+    def components(self, file: str, ga: GraphAlgo, nxg):
+        expected = None
+        if nxg is not None:
+            expected = {frozenset(comp) for comp in nx.strongly_connected_components(nxg)}
+        keys = list(ga.get_graph().get_all_v())[:10]
+        for backend in GraphAlgo.BACKENDS:
+            try:
+                algo = GraphAlgo(ga.get_graph(), backend=backend)
+            except ImportError:
+                continue
+            ok = None if expected is None else {frozenset(comp) for comp in algo.connected_components()} == expected
+            self.run("components", file, backend, algo.connected_components, ok)
+            ok = None if expected is None else all(frozenset(algo.connected_component(k)) in expected for k in keys)
+            self.run("component", file, backend, lambda: [algo.connected_component(k) for k in keys], ok, len(keys))
+        if nxg is not None:
+            self.run("components", file, "networkx", lambda: list(nx.strongly_connected_components(nxg)))
+
+    """Add and remove random edges between component queries, every call undoes its changes
+       so all the calls see the same graph"""
+
+    def mutations(self, file: str, nxg, changes: int):
+        for track in [False, True]:
+            ga = GraphAlgo(cache_size=0)
+            ga.load_from_json(file)
+            g = ga.get_graph()
+            ga.track_components(track)
+            keys = list(g.get_all_v())
+            rand = random.Random(self.seed)
+            added = [(rand.choice(keys), rand.choice(keys)) for i in range(changes)]
+            added = [(id1, id2) for id1, id2 in added if id1 != id2 and id2 not in g.all_out_edges_of_node(id1)]
+            added = list(dict.fromkeys(added))
+            removed = list()
+            for n in rand.sample(keys, min(changes, len(keys))):
+                edges = g.all_out_edges_of_node(n)
+                if len(edges) != 0:
+                    e = rand.choice(list(edges))
+                    removed.append((n, e, edges[e]))
+
+            def change():
+                for id1, id2 in added:
+                    g.add_edge(id1, id2, 1.5)
+                    ga.connected_components()
+                for id1, id2, w in removed:
+                    g.remove_edge(id1, id2)
+                    ga.connected_components()
+                middle = ga.connected_components()
+                for id1, id2 in added:
+                    g.remove_edge(id1, id2)
+                for id1, id2, w in removed:
+                    g.add_edge(id1, id2, w)
+                return middle
+
+            ok = None
+            if nxg is not None:
+                middle = change()
+                changed = to_networkx(g)
+                changed.add_edges_from((id1, id2) for id1, id2 in added)
+                changed.remove_edges_from((id1, id2) for id1, id2, w in removed)
+                expected = {frozenset(comp) for comp in nx.strongly_connected_components(changed)}
+                ok = {frozenset(comp) for comp in middle} == expected
+            self.run("mutation", file, "tracked" if track else "recomputed", change, ok,
+                     len(added) + len(removed))
+
+    @staticmethod
+    def _nx_distance(nxg, id1, id2) -> float:
+        try:
+            return nx.dijkstra_path_length(nxg, id1, id2)
+        except nx.NetworkXNoPath:
+            return float('inf')
+
+    """Write the results and the machine they ran on to a json file
+       @param file_name: the path to the file"""
+
+    def write(self, file_name: str):
+        info = {"machine": {"python": sys.version.split()[0], "platform": platform.platform(),
+                            "processor": platform.processor(), "cpus": os.cpu_count()},
+                "settings": {"warmup": self.warmup, "repeats": self.repeats, "seed": self.seed,
+                             "checked": self.check},
+                "results": self.results}
+        with open(file_name, "w") as json_file:
+            json.dump(info, json_file, indent=1)
+
+    """Return the results that failed their check"""
+
+    def mismatches(self) -> list:
+        return [r for r in self.results if r["ok"] is False]
+
+
+"""Compare results with the results of an earlier run
+   @param results: a list of result dictionaries
+   @param baseline: a list of the earlier result dictionaries
+   @param tolerance: the median time may grow by this factor before it is a regression
+   @return a list of (workload, file, variant, old median, new median) of the regressions"""
+
+
+def compare(results: list, baseline: list, tolerance: float = 1.25) -> list:
+    old = {(r["workload"], r["file"], r["variant"]): r["median"] for r in baseline}
+    regressions = list()
+    for r in results:
+        key = (r["workload"], r["file"], r["variant"])
+        if key in old and r["median"] > old[key] * tolerance:
+            regressions.append(key + (old[key], r["median"]))
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="GraphAlgo benchmarks")
+    parser.add_argument("--files", nargs="*", help="graph files, default the data files")
+    parser.add_argument("--scale", nargs="*", type=int, default=[],
+                        help="edge counts of synthetic graphs to add (see GraphGenerator), with 8 edges per node")
+    parser.add_argument("--quick", action="store_true", help="two small files and fewer repeats")
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--no-check", action="store_true", help="skip the networkx checks")
+    parser.add_argument("--output", default="benchmark.json")
+    parser.add_argument("--baseline", help="an earlier output to compare with")
+    parser.add_argument("--tolerance", type=float, default=1.25)
+    args = parser.parse_args(argv)
+
+    if args.quick:
+        args.repeats = min(args.repeats, 3)
+    files = args.files
+    if files is None:
+        files = [os.path.join(DATA_DIR, f) for f in (QUICK_FILES if args.quick else DATA_FILES)]
+    bench = Benchmark(args.warmup, args.repeats, not args.no_check, args.seed)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for e in args.scale:
+            files.append(GraphGenerator.generate(e // 8, e, args.seed, directory=tmp))
+        for file in files:
+            bench.run_file(file, args.queries)
+    bench.write(args.output)
+
+    failed = len(bench.mismatches()) != 0
+    if args.baseline is not None:
+        with open(args.baseline) as json_file:
+            baseline = json.load(json_file)["results"]
+        for workload, file, variant, old, new in compare(bench.results, baseline, args.tolerance):
+            print("regression", workload, file, variant, old, "->", new)
+            failed = True
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,47 @@
+import json
+import os
+import tempfile
+import unittest
+import Benchmark
+
+
+class MyTestCase(unittest.TestCase):
+
+    def test_percentile(self):
+        self.assertEqual(Benchmark.percentile([3, 1, 2], 50), 2)
+        self.assertEqual(Benchmark.percentile([1, 2, 3, 4], 50), 2.5)
+        self.assertAlmostEqual(Benchmark.percentile(range(11), 90), 9)
+        self.assertEqual(Benchmark.percentile([5], 99), 5)
+
+    def test_measure(self):
+        calls = list()
+        result = Benchmark.measure(lambda: calls.append(1), warmup=2, repeats=4)
+        self.assertEqual(len(calls), 6)
+        self.assertEqual(len(result["runs"]), 4)
+        self.assertLessEqual(result["min"], result["median"])
+        self.assertLessEqual(result["median"], result["p90"])
+        self.assertLessEqual(result["p90"], result["max"])
+
+    def test_compare(self):
+        old = [{"workload": "load", "file": "A0", "variant": "json", "median": 1.0},
+               {"workload": "save", "file": "A0", "variant": "json", "median": 1.0}]
+        new = [{"workload": "load", "file": "A0", "variant": "json", "median": 1.2},
+               {"workload": "save", "file": "A0", "variant": "json", "median": 1.5},
+               {"workload": "save", "file": "A1", "variant": "json", "median": 9.0}]
+        self.assertEqual(Benchmark.compare(new, old), [("save", "A0", "json", 1.0, 1.5)])
+
+    def test_main(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            out = os.path.join(tmp, 'out.json')
+            code = Benchmark.main(['--files', '../data/A0', '--repeats', '1', '--warmup', '0', '--output', out])
+            self.assertEqual(code, 0)
+            with open(out) as json_file:
+                info = json.load(json_file)
+            self.assertEqual(info["settings"]["repeats"], 1)
+            workloads = {r["workload"] for r in info["results"]}
+            self.assertTrue({"load", "save", "shortest_path", "components", "mutation"} <= workloads)
+            self.assertTrue(all(r["ok"] is not False for r in info["results"]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,327 @@
+import json
+import mmap
+import operator
+import os
+import struct
+import sys
+from array import array
+from collections.abc import Mapping
+from GraphInterface import GraphInterface
+
+""" an implementation of abstract class GraphInterface.
+    an immutable snapshot of a directed weighted graph in compressed sparse row (CSR) form,
+    the nodes are numbered by rows 0..n-1 in the order of the source graph,
+    the out edges of row r are targets[offsets[r]:offsets[r + 1]] with the matching weights.
+    the in edges are kept in a second (reverse) CSR that is built the first time it is needed.
+
+    binary file format (little endian), every section starts at a multiple of 8 bytes:
+    magic "DWGCSR01", header <n, m, has_pos, mc, dense_ids> as int64,
+    ids int64[n], offsets int32[n + 1], targets int32[m], weights float64[m], positions float64[3n] if has_pos"""
+
+MAGIC = b"DWGCSR01"
+HEADER = struct.Struct("<8s5q")
+
+
+class CSRFormatError(IOError):
+    """Raised by CSRGraph.load when a file isn't a complete binary graph file"""
+
+
+class CSRGraph(GraphInterface):
+    """A read only view of the snapshot's nodes {node id<int>: row<int>}"""
+
+    class NodeView(Mapping):
+
+        def __init__(self, graph):
+            self.graph = graph
+
+        def __getitem__(self, key):
+            row = self.graph.row_of(key)
+            if row is None:
+                raise KeyError(key)
+            return row
+
+        def __iter__(self):
+            return iter(self.graph.ids)
+
+        def __len__(self):
+            return len(self.graph.ids)
+
+        def __contains__(self, key):
+            return self.graph.row_of(key) is not None
+
+    ################### CSRGraph_Class ##############################################################################
+
+    """Create a snapshot from its arrays
+       @param ids: the node id of every row (array of int64)
+       @param offsets: n + 1 edge offsets (array of int32)
+       @param targets: the row of every edge's dest (array of int32)
+       @param weights: the weight of every edge (array of float64)
+       @param positions: x, y, z of every row (array of float64, nan when the node has no position), or None
+       @param mc: the modification count of the graph the snapshot was taken from
+       @param dense_ids: if the ids are exactly the rows 0..n-1, checked when None"""
+
+    def __init__(self, ids, offsets, targets, weights, positions=None, mc=0, dense_ids=None):
+        self.ids = ids
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self.positions = positions
+        self.mc = mc
+        self.r_offsets = None
+        self.r_sources = None
+        self.r_weights = None
+        self._rows = None
+        if dense_ids is None:
+            dense_ids = all(ids[r] == r for r in range(len(ids)))
+        if not dense_ids:
+            self._rows = {key: r for r, key in enumerate(ids)}
+
+    """Take a snapshot of a graph, the nodes keep the graph's order
+       @param graph: any GraphInterface
+       @return a new CSRGraph"""
+
+    @classmethod
+    def from_graph(cls, graph: GraphInterface):
+        nodes = graph.get_all_v()
+        ids = array('q', nodes)
+        rows = {key: r for r, key in enumerate(ids)}
+        offsets = array('i', [0])
+        targets = array('i')
+        weights = array('d')
+        positions = array('d')
+        has_pos = False
+        nan = float('nan')
+
+        for key in ids:
+            edges = graph.all_out_edges_of_node(key)
+            targets.extend([rows[e] for e in edges])
+            weights.extend(edges.values())
+            offsets.append(len(targets))
+            pos = graph.get_node_pos(key)
+            if pos is None:
+                positions.extend((nan, nan, nan))
+            else:
+                has_pos = True
+                positions.extend((tuple(pos) + (0.0, 0.0))[:3])
+
+        return cls(ids, offsets, targets, weights, positions if has_pos else None, graph.get_mc())
+
+    """Save the snapshot in the binary format
+       @param file_name: the path to the file"""
+
+    def save(self, file_name: str):
+        n = len(self.ids)
+        m = len(self.targets)
+        has_pos = self.positions is not None
+        with open(file_name, "wb") as out:
+            out.write(HEADER.pack(MAGIC, n, m, int(has_pos), self.mc, int(self._rows is None)))
+            sections = [array('q', self.ids), array('i', self.offsets), array('i', self.targets),
+                        array('d', self.weights)]
+            if has_pos:
+                sections.append(array('d', self.positions))
+            for section in sections:
+                if sys.byteorder != "little":
+                    section.byteswap()
+                out.write(section.tobytes())
+                out.write(bytes(-out.tell() % 8))
+
+    """Load a snapshot saved by save
+       @param file_name: the path to the file
+       @param use_mmap: map the file to memory instead of reading it, the arrays are then views of the file
+                        and nothing is copied until it is used
+       @return a new CSRGraph
+       @raise CSRFormatError: if the file is empty, cut short, not a binary graph file,
+                              or its edge offsets or targets don't fit its nodes"""
+
+    @classmethod
+    def load(cls, file_name: str, use_mmap: bool = True):
+        with open(file_name, "rb") as in_file:
+            if os.fstat(in_file.fileno()).st_size < HEADER.size:
+                raise CSRFormatError("%s is too short to be a binary graph file" % file_name)
+            if use_mmap and sys.byteorder == "little":
+                buffer = memoryview(mmap.mmap(in_file.fileno(), 0, access=mmap.ACCESS_READ))
+            else:
+                buffer = memoryview(in_file.read())
+
+        magic, n, m, has_pos, mc, dense_ids = HEADER.unpack_from(buffer)
+        if magic != MAGIC:
+            raise CSRFormatError("%s is not a binary graph file" % file_name)
+        layout = [('q', n), ('i', n + 1), ('i', m), ('d', m), ('d', 3 * n if has_pos else 0)]
+        if n < 0 or m < 0 or cls._file_size(layout) > len(buffer):
+            raise CSRFormatError("%s is cut short, its header needs %d nodes and %d edges" % (file_name, n, m))
+        start = HEADER.size
+        sections = []
+        for code, size in layout:
+            end = start + size * struct.calcsize(code)
+            section = buffer[start:end].cast(code)
+            if sys.byteorder != "little":
+                section = array(code, section)
+                section.byteswap()
+            sections.append(section)
+            start = end + (-end % 8)
+
+        ids, offsets, targets, weights, positions = sections
+        if offsets[0] != 0 or offsets[n] != m or any(map(operator.gt, offsets[:-1], offsets[1:])):
+            raise CSRFormatError("%s has edge offsets that don't match its header" % file_name)
+        if m > 0 and (min(targets) < 0 or max(targets) >= n):
+            raise CSRFormatError("%s has edges to nodes it doesn't have" % file_name)
+        return cls(ids, offsets, targets, weights, positions if has_pos else None, mc, bool(dense_ids))
+
+    """Return the bytes a file of these sections takes, every section but the last padded to 8 bytes"""
+
+    @staticmethod
+    def _file_size(layout) -> int:
+        end = HEADER.size
+        for code, size in layout:
+            end += -end % 8
+            end += size * struct.calcsize(code)
+        return end
+
+    """Pickle the snapshot as plain arrays (also when it is a view of a memory mapped file),
+       the reverse CSR is not sent and is rebuilt when needed"""
+
+    def __reduce__(self):
+        positions = None if self.positions is None else array('d', self.positions)
+        return CSRGraph, (array('q', self.ids), array('i', self.offsets), array('i', self.targets),
+                          array('d', self.weights), positions, self.mc, self._rows is None)
+
+    """A snapshot is already frozen
+       @return this snapshot"""
+
+    def freeze(self):
+        return self
+
+    """Return the row of the given node id
+       @param key: the node id, an int or any integral type like the NumPy ints
+       @return the row, or None if the node is not in the snapshot"""
+
+    def row_of(self, key):
+        if self._rows is not None:
+            return self._rows.get(key)
+        if type(key) is not int:
+            try:
+                key = operator.index(key)
+            except TypeError:
+                return None
+        if 0 <= key < len(self.ids):
+            return key
+        return None
+
+    def v_size(self) -> int:
+        return len(self.ids)
+
+    def e_size(self) -> int:
+        return len(self.targets)
+
+    def get_mc(self) -> int:
+        return self.mc
+
+    """Returns a read only dictionary of all the nodes {node id<int>: row<int>}"""
+
+    def get_all_v(self) -> dict:
+        return CSRGraph.NodeView(self)
+
+    """Returns a dictionary of all the edges exiting the node {dest id<int>: edge weight<float>}
+       @returns a dictionary of all the edges exiting the node {dest id<int>: edge weight<float>}"""
+
+    def all_out_edges_of_node(self, id1: int) -> dict:
+        r = self.row_of(id1)
+        if r is not None:
+            return self._edge_dict(self.offsets, self.targets, self.weights, r)
+
+    """Returns a dictionary of all the edges entering the node {src id<int>: edge weight<float>}
+       @returns a dictionary of all the edges entering the node {src id<int>: edge weight<float>}"""
+
+    def all_in_edges_of_node(self, id1: int) -> dict:
+        r = self.row_of(id1)
+        if r is not None:
+            if self.r_offsets is None:
+                self._build_reverse()
+            return self._edge_dict(self.r_offsets, self.r_sources, self.r_weights, r)
+
+    """Return the position of the node
+       @return a tuple (x, y, z), or None if the node has no position"""
+
+    def get_node_pos(self, id1: int):
+        r = self.row_of(id1)
+        if r is None or self.positions is None:
+            return None
+        pos = tuple(self.positions[3 * r:3 * r + 3])
+        if pos[0] != pos[0]:
+            return None
+        return pos
+
+    """The snapshot is immutable, all the changing functions do nothing
+       @return False"""
+
+    def add_node(self, node_id: int, pos: tuple = None) -> bool:
+        return False
+
+    def add_edge(self, id1: int, id2: int, weight: float) -> bool:
+        return False
+
+    def remove_node(self, node_id: int) -> bool:
+        return False
+
+    def remove_edge(self, node_id1: int, node_id2: int) -> bool:
+        return False
+
+    def __repr__(self):
+        info = json.dumps(self.get_graph())
+        return info
+
+    """Returns a dictionary containing all the edges and nodes of the graph, in the same format as DiGraph
+       @return a dictionary containing all the edges and nodes of the graph
+       {Edges:[edge1, edge2 ...], Nodes:[node1, node2, ...]}"""
+
+    def get_graph(self):
+        node_list = []
+        edge_list = []
+        for r, key in enumerate(self.ids):
+            pos = self.get_node_pos(key)
+            if pos is None:
+                node_list.append({"id": key})
+            else:
+                str_pos = "%.16lf,%.16lf,%.16lf" % pos
+                node_list.append({"pos": str_pos, "id": key})
+            for i in range(self.offsets[r], self.offsets[r + 1]):
+                edge_list.append({"src": key, "w": self.weights[i], "dest": self.ids[self.targets[i]]})
+        return {"Edges": edge_list, "Nodes": node_list}
+
+    """Build the dictionary of one row's edges, translating rows back to node ids"""
+
+    def _edge_dict(self, offsets, targets, weights, r):
+        a = offsets[r]
+        b = offsets[r + 1]
+        if self._rows is None:
+            return dict(zip(targets[a:b], weights[a:b]))
+        ids = self.ids
+        return dict(zip([ids[t] for t in targets[a:b]], weights[a:b]))
+
+    """Build the reverse CSR (the in edges of every row) with a counting sort over the edges"""
+
+    def _build_reverse(self):
+        n = len(self.ids)
+        offsets = self.offsets
+        targets = self.targets
+        weights = self.weights
+        r_offsets = array('i', bytes(4 * (n + 1)))
+        for t in targets:
+            r_offsets[t + 1] += 1
+        for r in range(n):
+            r_offsets[r + 1] += r_offsets[r]
+
+        fill = array('i', r_offsets)
+        r_sources = array('i', bytes(4 * len(targets)))
+        r_weights = array('d', bytes(8 * len(targets)))
+        for r in range(n):
+            for i in range(offsets[r], offsets[r + 1]):
+                t = targets[i]
+                j = fill[t]
+                r_sources[j] = r
+                r_weights[j] = weights[i]
+                fill[t] = j + 1
+
+        self.r_sources = r_sources
+        self.r_weights = r_weights
+        self.r_offsets = r_offsets
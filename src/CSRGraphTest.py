@@ -0,0 +1,154 @@
+import os
+import pickle
+import struct
+import tempfile
+import unittest
+import numpy as np
+from DiGraph import DiGraph
+from GraphAlgo import GraphAlgo
+from CSRGraph import CSRGraph, CSRFormatError, HEADER
+
+
+class MyTestCase(unittest.TestCase):
+
+    def test_edges(self):
+        graph = DiGraph()
+        for i in [5, 1, 7, 3]:
+            graph.add_node(i, (i, i * 2, 0))
+        graph.add_edge(5, 1, 1.5)
+        graph.add_edge(5, 7, 2.25)
+        graph.add_edge(7, 5, 3.5)
+        graph.add_edge(3, 5, 0.75)
+        csr = graph.freeze()
+
+        self.assertEqual(csr.v_size(), 4)
+        self.assertEqual(csr.e_size(), 4)
+        self.assertEqual(csr.get_mc(), graph.get_mc())
+        self.assertEqual(list(csr.get_all_v()), [5, 1, 7, 3])
+        for n in graph.get_all_v():
+            self.assertEqual(csr.all_out_edges_of_node(n), graph.all_out_edges_of_node(n))
+            self.assertEqual(csr.all_in_edges_of_node(n), graph.all_in_edges_of_node(n))
+        self.assertIsNone(csr.all_out_edges_of_node(2))
+        self.assertEqual(csr.get_node_pos(7), (7, 14, 0))
+        self.assertEqual(repr(csr), repr(graph))
+
+    def test_numpy_ids(self):
+        ga = GraphAlgo()
+        ga.load_from_json('../data/A0')
+        csr = ga.get_graph().freeze()
+        for key in np.arange(csr.v_size()):
+            self.assertEqual(csr.row_of(key), int(key))
+            self.assertEqual(csr.all_out_edges_of_node(key), csr.all_out_edges_of_node(int(key)))
+            self.assertEqual(csr.get_node_pos(np.int32(key)), csr.get_node_pos(int(key)))
+        self.assertIsNone(csr.row_of(np.int64(csr.v_size())))
+        self.assertIsNone(csr.row_of(1.0))
+        self.assertIsNone(csr.row_of("1"))
+
+    def test_immutable(self):
+        graph = DiGraph()
+        for i in range(3):
+            graph.add_node(i)
+        graph.add_edge(0, 1, 1)
+        csr = graph.freeze()
+        graph.add_edge(1, 2, 1)
+
+        self.assertFalse(csr.add_edge(1, 2, 1))
+        self.assertFalse(csr.add_node(3))
+        self.assertFalse(csr.remove_node(0))
+        self.assertFalse(csr.remove_edge(0, 1))
+        self.assertEqual(csr.e_size(), 1)
+        self.assertIsNone(csr.get_node_pos(0))
+
+    def test_algorithms(self):
+        ga = GraphAlgo()
+        ga.load_from_json('../data/G_1000_8000_1.json')
+        csr_ga = GraphAlgo(ga.get_graph().freeze())
+
+        self.assertEqual(csr_ga.connected_components(), ga.connected_components())
+        self.assertEqual(csr_ga.connected_component(17), ga.connected_component(17))
+        for i in range(0, 1000, 97):
+            self.assertEqual(csr_ga.shortest_path(i, 999 - i), ga.shortest_path(i, 999 - i))
+
+    def test_binary(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            for file in ['../data/A3', '../data/T0.json']:
+                ga = GraphAlgo()
+                ga.load_from_json(file)
+                bin_file = os.path.join(tmp, 'graph.bin')
+                self.assertTrue(ga.save_binary(bin_file))
+                for use_mmap in [True, False]:
+                    loaded = GraphAlgo()
+                    self.assertTrue(loaded.load_binary(bin_file, use_mmap))
+                    g = loaded.get_graph()
+                    for n in ga.get_graph().get_all_v():
+                        self.assertEqual(g.all_out_edges_of_node(n), ga.get_graph().all_out_edges_of_node(n))
+                        self.assertEqual(g.get_node_pos(n), ga.get_graph().get_node_pos(n))
+                    self.assertEqual(g.get_mc(), ga.get_graph().get_mc())
+                    self.assertEqual(loaded.connected_components(), ga.connected_components())
+                    self.assertEqual(loaded.shortest_path(0, 3), ga.shortest_path(0, 3))
+
+                    copy = pickle.loads(pickle.dumps(g))
+                    self.assertEqual(repr(copy), repr(g))
+
+            graph = DiGraph()
+            for i in [10, 4, 7]:
+                graph.add_node(i)
+            graph.add_edge(10, 7, 0.5)
+            ga = GraphAlgo(graph)
+            self.assertTrue(ga.save_binary(bin_file))
+            self.assertTrue(ga.load_binary(bin_file))
+            self.assertEqual(ga.get_graph().all_in_edges_of_node(7), {10: 0.5})
+            self.assertIsNone(ga.get_graph().get_node_pos(4))
+            self.assertFalse(ga.load_binary(os.path.join(tmp, 'missing.bin')))
+
+            with open(bin_file, 'wb') as out:
+                out.write(b'not a graph file' * 4)
+            self.assertFalse(ga.load_binary(bin_file))
+
+    def test_truncated(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            ga = GraphAlgo()
+            ga.load_from_json('../data/A1')
+            bin_file = os.path.join(tmp, 'A1.bin')
+            ga.save_binary(bin_file)
+            with open(bin_file, 'rb') as in_file:
+                data = in_file.read()
+            cut_file = os.path.join(tmp, 'cut.bin')
+            for size in [0, 10, HEADER.size, 56, len(data) // 2, len(data) - 8]:
+                with open(cut_file, 'wb') as out:
+                    out.write(data[:size])
+                for use_mmap in [True, False]:
+                    loaded = GraphAlgo()
+                    self.assertFalse(loaded.load_binary(cut_file, use_mmap))
+                    self.assertEqual(loaded.get_graph().v_size(), 0)
+                    with self.assertRaises(CSRFormatError):
+                        CSRGraph.load(cut_file, use_mmap)
+            self.assertTrue(ga.load_binary(bin_file))
+            self.assertEqual(ga.get_graph().v_size(), 17)
+
+    def test_corrupt(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            ga = GraphAlgo()
+            ga.load_from_json('../data/A1')
+            bin_file = os.path.join(tmp, 'A1.bin')
+            ga.save_binary(bin_file)
+            with open(bin_file, 'rb') as in_file:
+                data = in_file.read()
+            n, m = ga.get_graph().v_size(), ga.get_graph().e_size()
+            offsets = HEADER.size + 8 * n
+            targets = offsets + 4 * (n + 1) + (-(offsets + 4 * (n + 1)) % 8)
+            bad_file = os.path.join(tmp, 'bad.bin')
+            for at, value in [(targets, n), (targets + 4 * (m - 1), -1), (offsets + 4 * 2, 0),
+                              (offsets + 4 * 5, m + 1)]:
+                bad = bytearray(data)
+                struct.pack_into('<i', bad, at, value)
+                with open(bad_file, 'wb') as out:
+                    out.write(bad)
+                for use_mmap in [True, False]:
+                    with self.assertRaises(CSRFormatError):
+                        CSRGraph.load(bad_file, use_mmap)
+                    self.assertFalse(GraphAlgo().load_binary(bad_file, use_mmap))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,14 @@
+import math
 import unittest
 import networkx as nx
-import time
+import os
+import random
+import tempfile
+import tracemalloc
 from GraphAlgo import GraphAlgo
+import PointSearch
+from Benchmark import Benchmark, measure
+import GraphGenerator
 
 import json
 
@@ -37,6 +44,50 @@ class Networkx:
 
 
 
+"""Count the edges scanned by the component BFS, with or without marking the nodes when they are queued
+   @return the number of scanned edges"""
+
+
+def count_cc_visits(graph, id1, mark_on_enqueue=True):
+    visits = 0
+    tag = {id1: 1}
+    que = [id1]
+    while len(que) != 0:
+        key = que.pop(0)
+        tag[key] = 1
+        edges = graph.all_out_edges_of_node(key)
+        visits += len(edges)
+        for edge in edges:
+            if edge not in tag:
+                if mark_on_enqueue:
+                    tag[edge] = 1
+                que.append(edge)
+    que.append(id1)
+    while len(que) != 0:
+        key = que.pop(0)
+        tag[key] = 2
+        revers_edges = graph.all_in_edges_of_node(key)
+        visits += len(revers_edges)
+        for e in revers_edges:
+            if tag.get(e) == 1:
+                if mark_on_enqueue:
+                    tag[e] = 2
+                que.append(e)
+    return visits
+
+
+"""Time a function with the Benchmark harness and print its median and p90
+   @param label: a tuple of what is printed before the times
+   @param count: the operations in one call, the times are printed per operation
+   @return the summary dictionary, see Benchmark.measure"""
+
+
+def report(label, func, warmup: int = 1, repeats: int = 5, count: int = 1) -> dict:
+    result = measure(func, warmup, repeats)
+    print(*label, "median", result["median"] / count, "p90", result["p90"] / count)
+    return result
+
+
 class MyTestCase(unittest.TestCase):
 
     def setUp(self) -> None:
@@ -50,33 +101,239 @@ class MyTestCase(unittest.TestCase):
 
 
     def test_nx_CCS(self):
-        start = time.time()
-        for i in range(10):
-            nx.strongly_connected_components(self.nxg)
-        end = time.time()
-        print((end - start)/10)
+        report(("networkx",), lambda: list(nx.strongly_connected_components(self.nxg)), repeats=10)
 
     def test_GA_shortest(self):
-        start = time.time()
-        for i in range(10):
-            self.ga.shortest_path(1, 25468)
-        end = time.time()
-        print((end - start)/10)
+        self.assertEqual(self.ga.shortest_path(1, 456)[0], nx.dijkstra_path_length(self.nxg, 1, 456))
+        report(("GraphAlgo",), lambda: self.ga.shortest_path(1, 456), repeats=10)
+
+    def test_benchmark_suite(self):
+        bench = Benchmark(repeats=3)
+        bench.run_file('../data/G_1000_8000_1.json')
+        self.assertEqual(bench.mismatches(), [])
+        with tempfile.TemporaryDirectory() as tmp:
+            bench.write(os.path.join(tmp, 'benchmark.json'))
+
+    def test_CSR_snapshot(self):
+        file = '../data/G_10000_80000_0.json'
+        tracemalloc.start()
+        ga = GraphAlgo()
+        ga.load_from_json(file)
+        graph_size = tracemalloc.get_traced_memory()[0]
+        csr_ga = GraphAlgo(ga.get_graph().freeze())
+        csr_size = tracemalloc.get_traced_memory()[0] - graph_size
+        tracemalloc.stop()
+        print("DiGraph bytes", graph_size, "CSRGraph bytes", csr_size)
+
+        for algo in [ga, csr_ga]:
+            name = type(algo.get_graph()).__name__
+            report((name, "shortest_path"), lambda: [algo.shortest_path(i, 9999 - i) for i in range(10)],
+                   repeats=3, count=10)
+            report((name, "connected_components"), algo.connected_components, repeats=3)
+
+    def test_load_memory(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            big_file = GraphGenerator.generate(125000, 1000000, directory=tmp)
+            pos_file = GraphGenerator.generate(200000, 400000, pos=True, directory=tmp)
+            for file in ['../data/G_10000_80000_0.json', big_file, pos_file]:
+                for lazy_pos in [True, False]:
+                    label = (os.path.basename(file), "lazy" if lazy_pos else "parsed")
+                    report(label, lambda: GraphAlgo().load_from_json(file, lazy_pos), warmup=0, repeats=3)
+                    ga = GraphAlgo()
+                    tracemalloc.start()
+                    ga.load_from_json(file, lazy_pos)
+                    size, peak = tracemalloc.get_traced_memory()
+                    tracemalloc.stop()
+                    print(*label, "bytes", size, "peak bytes", peak)
+
+    def test_save_memory(self):
+        ga = GraphAlgo()
+        ga.load_from_json('../data/G_10000_80000_0.json')
+        with tempfile.TemporaryDirectory() as tmp:
+            file = os.path.join(tmp, 'out.json')
+
+            def save_repr():
+                with open(file, "w") as json_file:
+                    json_file.write(repr(ga.get_graph()))
+
+            for name, save in [("repr", save_repr), ("stream", lambda: ga.save_to_json(file)),
+                               ("stream gzip", lambda: ga.save_to_json(file + '.gz'))]:
+                report((name,), save, repeats=3)
+                tracemalloc.start()
+                save()
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+                print(name, "peak bytes", peak)
+
+    def test_binary_cold_start(self):
+        file = '../data/G_10000_80000_0.json'
+        with tempfile.TemporaryDirectory() as tmp:
+            bin_file = os.path.join(tmp, 'G_10000_80000_0.bin')
+            report(("json load",), lambda: GraphAlgo().load_from_json(file), warmup=0, repeats=3)
+            ga = GraphAlgo()
+            ga.load_from_json(file)
+            ga.save_binary(bin_file)
+            for use_mmap in [True, False]:
+                def cold_start():
+                    ga = GraphAlgo()
+                    ga.load_binary(bin_file, use_mmap)
+                    ga.shortest_path(1, 2)
+
+                report(("binary load + first query, mmap" if use_mmap else "binary load + first query",),
+                       cold_start, warmup=0, repeats=3)
+
+    def test_generated_scale(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            for e in [10 ** 5, 10 ** 6, 10 ** 7]:
+                files = list()
+                report(("G", e, "generate"),
+                       lambda: files.append(GraphGenerator.generate(e // 8, e, directory=tmp, binary=True)),
+                       warmup=0, repeats=1)
+                file = files[0]
+                ga = GraphAlgo()
+                comps = list()
+
+                def load_components():
+                    ga.load_binary(file)
+                    comps[:] = ga.connected_components()
+
+                report((os.path.basename(file), "load + components"), load_components, warmup=0, repeats=1)
+                report((os.path.basename(file), "shortest_path"), lambda: ga.shortest_path(0, e // 8 - 1),
+                       warmup=0, repeats=1)
+                print(os.path.basename(file), "components", len(comps))
+                os.remove(file)
+
+    def test_GA_shortest_cache(self):
+        file = '../data/G_10000_80000_0.json'
+        for cache_size in [0, 8]:
+            ga = GraphAlgo(cache_size=cache_size)
+            ga.load_from_json(file)
+            report(("cache size", cache_size), lambda: [ga.shortest_path(i % 4, 9999 - i) for i in range(100)],
+                   warmup=0, repeats=3, count=100)
+            print("cache size", cache_size, ga.get_cache_stats())
+
+    def test_GA_shortest_paths_from(self):
+        ga = GraphAlgo(cache_size=0)
+        ga.load_from_json('../data/G_10000_80000_0.json')
+        targets = range(0, 10000, 50)
+        report(("shortest_path loop",), lambda: [ga.shortest_path(1, t) for t in targets], repeats=3)
+
+        def paths_from():
+            dist, tree = ga.shortest_paths_from(1, targets)
+            return [tree.path(t) for t in targets]
+
+        report(("shortest_paths_from",), paths_from, repeats=3)
+
+    def test_distance_matrix_scaling(self):
+        ga = GraphAlgo()
+        ga.load_from_json('../data/G_1000_8000_0.json')
+        for workers in [1, 2, 4, 8]:
+            report(("workers", workers, "cpus", os.cpu_count()),
+                   lambda: ga.distance_matrix(range(200), workers=workers), warmup=0, repeats=3)
+
+    def test_GA_shortest_methods(self):
+        files = ['../data/A%d' % i for i in range(6)] + ['../data/G_1000_8000_0.json', '../data/G_10000_80000_0.json']
+        for file in files:
+            ga = GraphAlgo(cache_size=0)
+            ga.load_from_json(file)
+            keys = list(ga.get_graph().get_all_v())
+            random.seed(3)
+            pairs = [(random.choice(keys), random.choice(keys)) for i in range(50)]
+            for method in GraphAlgo.PATH_METHODS:
+                if method == "ch" and not os.path.basename(file).startswith('A'):
+                    continue
+                report((file, method), lambda: [ga.shortest_path(id1, id2, method=method) for id1, id2 in pairs],
+                       repeats=3, count=50)
+            settled = sum(PointSearch.bidirectional(ga.get_graph(), id1, id2)[2] for id1, id2 in pairs)
+            print(file, "bidirectional settled nodes", settled)
+
+    def test_GA_landmarks(self):
+        ga = GraphAlgo(cache_size=0)
+        ga.load_from_json('../data/G_10000_80000_0.json')
+        random.seed(3)
+        pairs = [(random.randrange(10000), random.randrange(10000)) for i in range(100)]
+        report(("dijkstra per query",), lambda: [ga.shortest_path(id1, id2) for id1, id2 in pairs],
+               repeats=3, count=100)
+        for k in [4, 8, 16]:
+            report(("alt k", k, "preprocessing"), lambda: ga.preprocess_landmarks(k), warmup=0, repeats=3)
+            report(("alt k", k, "per query"), lambda: [ga.shortest_path(id1, id2, method="alt") for id1, id2 in pairs],
+                   repeats=3, count=100)
+
+    def test_GA_ch(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            for file in ['../data/A%d' % i for i in range(6)] + ['../data/G_1000_8000_%d.json' % i for i in range(2)]:
+                ga = GraphAlgo(cache_size=0)
+                ga.load_from_json(file)
+                keys = list(ga.get_graph().get_all_v())
+                random.seed(3)
+                pairs = [(random.choice(keys), random.choice(keys)) for i in range(1000)]
+                expected = [ga.shortest_path(id1, id2)[0] for id1, id2 in pairs]
+                report((file, "dijkstra per query"), lambda: [ga.shortest_path(id1, id2) for id1, id2 in pairs],
+                       repeats=3, count=1000)
+                ch_file = os.path.join(tmp, os.path.basename(file) + '.ch')
+                report((file, "build"), lambda: ga.preprocess_ch(ch_file), warmup=0, repeats=1)
+                report((file, "load"), lambda: ga.preprocess_ch(ch_file), repeats=3)
+                got = [ga.shortest_path(id1, id2, method="ch")[0] for id1, id2 in pairs]
+                self.assertTrue(all(math.isclose(a, b) for a, b in zip(got, expected)))
+                report((file, "ch per query"),
+                       lambda: [ga.shortest_path(id1, id2, method="ch") for id1, id2 in pairs], repeats=3, count=1000)
+                print(file, "shortcuts", len(ga._ch.middle))
+
+    def test_GA_backends(self):
+        ga = GraphAlgo()
+        ga.load_from_json('../data/G_10000_80000_0.json')
+        sparse_ga = GraphAlgo(ga.get_graph(), backend="numpy")
+        report(("numpy conversion",), lambda: GraphAlgo(ga.get_graph(), backend="numpy")._sparse_graph(),
+               warmup=0, repeats=3)
+        for algo in [ga, sparse_ga]:
+            report((algo.backend, "connected_components"), algo.connected_components, repeats=10)
+            report((algo.backend, "connected_component"), lambda: [algo.connected_component(i) for i in range(10)],
+                   repeats=3, count=10)
+            report((algo.backend, "distance_matrix 100 sources"), lambda: algo.distance_matrix(range(100), workers=1),
+                   repeats=3)
+
+    def test_GA_instrumented(self):
+        ga = GraphAlgo(cache_size=0)
+        ga.load_from_json('../data/G_10000_80000_0.json')
+        keys = list(ga.get_graph().get_all_v())[:20]
+        for enable in [False, True]:
+            ga.instrument(enable)
+            for method in ["dijkstra", "bidirectional", "alt"]:
+                report(("instrumented" if enable else "plain", method),
+                       lambda: [ga.shortest_path(k, keys[-1], method) for k in keys[:-1]], repeats=3)
+                print(ga.last_stats)
+        ga.instrument(False)
+
+    def test_GA_plot(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            for file in ['../data/A5', '../data/G_1000_8000_0.json', '../data/G_10000_80000_0.json']:
+                ga = GraphAlgo()
+                ga.load_from_json(file)
+                for ext in ["png", "svg"]:
+                    out = os.path.join(tmp, "plot." + ext)
+                    report((os.path.basename(file), ext), lambda: ga.plot_graph(out), warmup=0, repeats=3)
+                    print(os.path.basename(file), ext, ga.plot_graph(out))
 
     def test_GA_CCS(self):
-        start = time.time()
-        for i in range(10):
-            self.ga.connected_components()
-        end = time.time()
-        print((end - start)/10)
+        self.assertEqual({frozenset(c) for c in self.ga.connected_components()},
+                         {frozenset(c) for c in nx.strongly_connected_components(self.nxg)})
+        report(("GraphAlgo",), self.ga.connected_components, repeats=10)
 
     def test_GA_CC(self):
-        start = time.time()
-        for i in range(10):
-            self.ga.connected_component(456)
-        end = time.time()
-        print((end - start)/10)
+        self.assertIn(set(self.ga.connected_component(456)),
+                      [c for c in nx.strongly_connected_components(self.nxg) if 456 in c])
+        report(("GraphAlgo",), lambda: self.ga.connected_component(456), repeats=10)
+
+    def test_CC_visited_edges(self):
+        for file in ['../data/G_1000_8000_0.json', '../data/G_1000_8000_1.json']:
+            ga = GraphAlgo()
+            ga.load_from_json(file)
+            g = ga.get_graph()
+            before = count_cc_visits(g, 0, False)
+            after = count_cc_visits(g, 0, True)
+            self.assertLess(after, before)
+            report((file, "edges scanned:", before, "->", after), lambda: ga.connected_component(0), repeats=10)
 
 
 if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+    unittest.main()
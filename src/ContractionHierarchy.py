@@ -0,0 +1,257 @@
+import hashlib
+import heapq
+import json
+import time
+from GraphJson import open_json
+
+"""A contraction hierarchies (CH) index of a directed weighted graph.
+   the nodes are contracted one by one, cheapest first by edge difference, and when a node is removed
+   a shortcut edge u->w is added for every path u->v->w that has no other path (witness) as short.
+   a query searches upward only, forward from the source and backward from the target, and the
+   shortcuts on the found path are unpacked back to the original nodes"""
+
+WITNESS_SETTLE_LIMIT = 64
+
+
+class ContractionHierarchy:
+    """Create an empty index, use build or load to fill it"""
+
+    def __init__(self):
+        self.v_size = 0
+        self.e_size = 0
+        self.mc = None
+        self.graph = None
+        self.fingerprint = None
+        self.rank = dict()
+        self.up = dict()
+        self.down = dict()
+        self.middle = dict()
+
+    """Build the index of a graph
+       @param graph: any GraphInterface, only read while building
+       @return the new ContractionHierarchy"""
+
+    @classmethod
+    def build(cls, graph):
+        ch = cls()
+        ch.v_size = graph.v_size()
+        ch.e_size = graph.e_size()
+        ch.mc = graph.get_mc()
+        ch.graph = graph
+        ch.fingerprint = fingerprint(graph)
+        out = {v: dict(graph.all_out_edges_of_node(v)) for v in graph.get_all_v()}
+        inn = {v: dict(graph.all_in_edges_of_node(v)) for v in graph.get_all_v()}
+        deleted = dict.fromkeys(out, 0)
+
+        que = [(ch._priority(v, out, inn, deleted), v) for v in out]
+        heapq.heapify(que)
+        while len(que) > 0:
+            priority, v = heapq.heappop(que)
+            new_priority = ch._priority(v, out, inn, deleted)
+            if len(que) > 0 and new_priority > que[0][0]:
+                heapq.heappush(que, (new_priority, v))
+                continue
+
+            ch.rank[v] = len(ch.rank)
+            for u, w, cost in ch._shortcuts(v, out, inn):
+                if cost < out[u].get(w, float('inf')):
+                    out[u][w] = cost
+                    inn[w][u] = cost
+                    ch.middle[(u, w)] = v
+            ch.up[v] = out.pop(v)
+            ch.down[v] = inn.pop(v)
+            for w in ch.up[v]:
+                del inn[w][v]
+                deleted[w] += 1
+            for u in ch.down[v]:
+                del out[u][v]
+                deleted[u] += 1
+
+        return ch
+
+    """The contraction order key of a node: shortcuts it would add, minus the edges it removes,
+       plus its contracted neighbors so the contractions spread over the graph"""
+
+    def _priority(self, v, out, inn, deleted):
+        return len(self._shortcuts(v, out, inn)) - len(out[v]) - len(inn[v]) + deleted[v]
+
+    """Find the shortcuts needed to contract v, a shortcut u->w is needed if a limited search from u
+       that avoids v finds no path to w as short as u->v->w
+       @return a list of (u, w, cost)"""
+
+    def _shortcuts(self, v, out, inn):
+        shortcuts = list()
+        out_v = out[v]
+        for u, w_uv in inn[v].items():
+            targets = {w: w_uv + w_vw for w, w_vw in out_v.items() if w != u}
+            if len(targets) == 0:
+                continue
+            dist = self._witness(u, v, out, targets)
+            for w, cost in targets.items():
+                if dist.get(w, float('inf')) > cost:
+                    shortcuts.append((u, w, cost))
+        return shortcuts
+
+    """A Dijkstra search from u that skips v, stops past the largest cost or after a few settled nodes
+       @return a dictionary of the distances found"""
+
+    def _witness(self, u, v, out, targets):
+        limit = max(targets.values())
+        dist = {u: 0}
+        que = [(0, u)]
+        settled = 0
+        while len(que) > 0 and settled < WITNESS_SETTLE_LIMIT:
+            d, key = heapq.heappop(que)
+            if d > dist[key]:
+                continue
+            if d > limit:
+                break
+            settled += 1
+            for edge, w in out[key].items():
+                if edge != v and d + w < dist.get(edge, float('inf')):
+                    dist[edge] = d + w
+                    heapq.heappush(que, (d + w, edge))
+        return dist
+
+    """Return if the index was built from this version of the graph"""
+
+    def is_valid(self, graph) -> bool:
+        return graph is self.graph and graph.get_mc() == self.mc
+
+    """Return if the index was built from a graph with the same nodes and edges, e.g. to check a loaded index,
+       and if it was tie the index to this graph
+       @param graph: any GraphInterface"""
+
+    def attach(self, graph) -> bool:
+        if graph.v_size() != self.v_size or graph.e_size() != self.e_size or fingerprint(graph) != self.fingerprint:
+            return False
+        self.graph = graph
+        self.mc = graph.get_mc()
+        return True
+
+    """Find the shortest path with an upward search from both ends
+       @param stats: a CallStats that gets the heap operations, the index's edges read and the unpacking time
+                     added, or None
+       @return the distance (float('inf') if there is no path), a list of the original nodes' ids
+               and the number of nodes the two searches settled"""
+
+    def query(self, src: int, dest: int, stats=None) -> (float, list, int):
+        dist_f, prev_f = self._upward(src, self.up, stats)
+        dist_b, prev_b = self._upward(dest, self.down, stats)
+        best = float('inf')
+        meet = None
+        for key, d in dist_f.items():
+            if key in dist_b and d + dist_b[key] < best:
+                best = d + dist_b[key]
+                meet = key
+        settled = len(dist_f) + len(dist_b)
+        if meet is None:
+            return float('inf'), list(), settled
+
+        start = time.perf_counter()
+        path = [meet]
+        key = meet
+        while prev_f[key] is not None:
+            path.extend(reversed(self._unpack(prev_f[key], key)[:-1]))
+            key = prev_f[key]
+        path.reverse()
+        key = meet
+        while prev_b[key] is not None:
+            path.extend(self._unpack(key, prev_b[key])[1:])
+            key = prev_b[key]
+        if stats is not None:
+            stats.path_seconds += time.perf_counter() - start
+        return best, path, settled
+
+    """A full Dijkstra search over the upward edges of one side
+       @return the distances and the predecessors"""
+
+    def _upward(self, src, edges_of, stats=None):
+        dist = {src: 0}
+        prev = {src: None}
+        que = [(0, src)]
+        pushes = 0
+        pops = 0
+        relaxed = 0
+        while len(que) > 0:
+            d, key = heapq.heappop(que)
+            pops += 1
+            if d > dist[key]:
+                continue
+            edges = edges_of[key]
+            relaxed += len(edges)
+            for edge, w in edges.items():
+                if d + w < dist.get(edge, float('inf')):
+                    dist[edge] = d + w
+                    prev[edge] = key
+                    heapq.heappush(que, (d + w, edge))
+                    pushes += 1
+        if stats is not None:
+            stats.heap_pushes += pushes
+            stats.heap_pops += pops
+            stats.settled += len(dist)
+            stats.relaxed += relaxed
+        return dist, prev
+
+    """Replace a shortcut u->w by the original edges it stands for
+       @return a list of the nodes' ids from u to w"""
+
+    def _unpack(self, u, w):
+        path = [u]
+        stack = [(u, w)]
+        while len(stack) > 0:
+            a, b = stack.pop()
+            mid = self.middle.get((a, b))
+            if mid is None:
+                path.append(b)
+            else:
+                stack.append((mid, b))
+                stack.append((a, mid))
+        return path
+
+    """Save the index to a json file (gzip compressed if the name ends with .gz)
+       @param file_name: the path to the file"""
+
+    def save(self, file_name: str):
+        info = {"v": self.v_size, "e": self.e_size, "mc": self.mc, "fingerprint": self.fingerprint,
+                "order": list(self.rank),
+                "up": [[v, w, d] for v in self.up for w, d in self.up[v].items()],
+                "down": [[v, u, d] for v in self.down for u, d in self.down[v].items()],
+                "middle": [[u, w, v] for (u, w), v in self.middle.items()]}
+        with open_json(file_name, "w") as json_file:
+            json.dump(info, json_file)
+
+    """Load an index saved by save, it isn't valid for any graph until attach
+       @param file_name: the path to the file
+       @return the loaded ContractionHierarchy"""
+
+    @classmethod
+    def load(cls, file_name: str):
+        with open_json(file_name, "r") as json_file:
+            info = json.load(json_file)
+        ch = cls()
+        ch.v_size = info["v"]
+        ch.e_size = info["e"]
+        ch.mc = info["mc"]
+        ch.fingerprint = info.get("fingerprint")
+        ch.rank = {v: r for r, v in enumerate(info["order"])}
+        ch.up = {v: dict() for v in info["order"]}
+        ch.down = {v: dict() for v in info["order"]}
+        for v, w, d in info["up"]:
+            ch.up[v][w] = d
+        for v, u, d in info["down"]:
+            ch.down[v][u] = d
+        ch.middle = {(u, w): v for u, w, v in info["middle"]}
+        return ch
+
+
+"""Return a hash of a graph's nodes, edges and weights, the same for the same graph in any order
+   @param graph: any GraphInterface
+   @return a hex string"""
+
+
+def fingerprint(graph) -> str:
+    digest = hashlib.sha256()
+    for v in sorted(graph.get_all_v()):
+        digest.update(repr((v, sorted(graph.all_out_edges_of_node(v).items()))).encode())
+    return digest.hexdigest()
@@ -0,0 +1,99 @@
+import os
+import random
+import tempfile
+import unittest
+from DiGraph import DiGraph
+from GraphAlgo import GraphAlgo
+from ContractionHierarchy import ContractionHierarchy
+
+
+class MyTestCase(unittest.TestCase):
+
+    def test_same_as_dijkstra(self):
+        for file in ['../data/A0', '../data/A3', '../data/G_100_800_1.json']:
+            ga = GraphAlgo(cache_size=0)
+            ga.load_from_json(file)
+            keys = list(ga.get_graph().get_all_v())
+            ga.preprocess_ch()
+            for id1 in keys[::7]:
+                for id2 in keys[::5]:
+                    self.assertEqual(ga.shortest_path(id1, id2, method="ch"), ga.shortest_path(id1, id2))
+
+    def test_shortcut_unpacking(self):
+        g = DiGraph()
+        for i in range(5):
+            g.add_node(i)
+        for i in range(4):
+            g.add_edge(i, i + 1, 1)
+        g.add_edge(0, 4, 10)
+        ch = ContractionHierarchy.build(g)
+        self.assertGreater(len(ch.middle), 0)
+        dist, path, settled = ch.query(0, 4)
+        self.assertEqual((dist, path), (4, [0, 1, 2, 3, 4]))
+        self.assertEqual(ch.query(4, 0)[:2], (float('inf'), []))
+
+    def test_save_load(self):
+        ga = GraphAlgo()
+        ga.load_from_json('../data/A1')
+        with tempfile.TemporaryDirectory() as tmp:
+            file = os.path.join(tmp, 'A1.ch')
+            ga.preprocess_ch(file)
+            self.assertTrue(os.path.exists(file))
+            built = ga._ch
+            ga.preprocess_ch(file)
+            self.assertIsNot(ga._ch, built)
+            self.assertEqual(ga._ch.up, built.up)
+            self.assertEqual(ga._ch.down, built.down)
+            self.assertEqual(ga._ch.middle, built.middle)
+            self.assertEqual(ga._ch.query(0, 16), built.query(0, 16))
+
+            ga.get_graph().remove_edge(0, 1)
+            ga.preprocess_ch(file)
+            self.assertTrue(ga._ch.is_valid(ga.get_graph()))
+            self.assertEqual(ContractionHierarchy.load(file).mc, ga.get_graph().get_mc())
+
+    def same_size_graph(self, seed):
+        random.seed(1)
+        edges = [(random.randrange(40), random.randrange(40)) for i in range(200)]
+        random.seed(seed)
+        g = DiGraph()
+        for i in range(40):
+            g.add_node(i)
+        for id1, id2 in edges:
+            g.add_edge(id1, id2, random.uniform(1, 20))
+        return g
+
+    def test_same_size_graphs(self):
+        ga = GraphAlgo(self.same_size_graph(0), cache_size=0)
+        with tempfile.TemporaryDirectory() as tmp:
+            file = os.path.join(tmp, 'G.ch')
+            ga.preprocess_ch(file)
+            first = ga._ch
+            g = self.same_size_graph(1)
+            self.assertEqual((g.get_mc(), g.v_size(), g.e_size()), (first.mc, first.v_size, first.e_size))
+            self.assertFalse(first.is_valid(g))
+            self.assertFalse(ContractionHierarchy.load(file).attach(g))
+            self.assertTrue(ContractionHierarchy.load(file).attach(self.same_size_graph(0)))
+            ga = GraphAlgo(g, cache_size=0)
+            ga.preprocess_ch(file)
+            self.assertIsNot(ga._ch, first)
+            for id1 in range(40):
+                for id2 in range(0, 40, 3):
+                    self.assertEqual(ga.shortest_path(id1, id2, method="ch"), ga.shortest_path(id1, id2))
+
+    def test_invalidate(self):
+        g = DiGraph()
+        for i in range(4):
+            g.add_node(i)
+        for i in range(3):
+            g.add_edge(i, i + 1, 1)
+        ga = GraphAlgo(g)
+        ga.preprocess_ch()
+        self.assertEqual(ga.shortest_path(0, 3, method="ch"), (3, [0, 1, 2, 3]))
+        g.add_edge(0, 3, 1.5)
+        self.assertEqual(ga.shortest_path(0, 3, method="ch"), (1.5, [0, 3]))
+        self.assertEqual(ga.shortest_path(3, 0, method="ch"), (float('inf'), []))
+
+
+if __name__ == '__main__':
+    unittest.main()
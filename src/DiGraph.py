@@ -1,5 +1,8 @@
 import json
+import threading
 from GraphInterface import GraphInterface
+from CSRGraph import CSRGraph
+from PositionTable import PositionTable
 
 """ an implementation of abstract class GraphInterface.
     implementing data structure of directed weighted graph"""
@@ -9,22 +12,26 @@ class DiGraph(GraphInterface):
     """A nested Node class, implements the node structure in the graph"""
 
     class Node:
+        __slots__ = ("key", "pos", "edges", "revers_edges", "path", "graph")
 
-        """Create a node with its unique id"""
+        """Create a node with its unique id,
+           the edge dictionaries and the path list are only created when something is put in them
+           @param graph: the DiGraph the node is in, told when the node is moved, or None"""
 
-        def __init__(self, key, pos=None):
+        def __init__(self, key, pos=None, graph=None):
             self.key = key
-            self.tag = 0
-            self.weight = 0
-            self.edges = dict()
             self.pos = pos
-            self.revers_edges = dict()
-            self.path = list()
+            self.edges = None
+            self.revers_edges = None
+            self.path = None
+            self.graph = graph
 
         """Returns a dictionary of all the edges exiting the node {dest id<int>: edge weight<float>}
                   @returns a dictionary of all the edges exiting the node {dest id<int>: edge weight<float>}"""
 
         def get_edges(self):
+            if self.edges is None:
+                return {}
             return self.edges
 
         """Connect this node to another with an edge,
@@ -32,8 +39,13 @@ class DiGraph(GraphInterface):
            @return if the connection was successful"""
 
         def add_edge(self, key, weight):
-            if key != self.key and self.edges.get(key) is None:
-                self.edges.update([(key, weight)])
+            if key == self.key:
+                return False
+            if self.edges is None:
+                self.edges = {key: weight}
+                return True
+            if key not in self.edges:
+                self.edges[key] = weight
                 return True
 
             return False
@@ -42,8 +54,8 @@ class DiGraph(GraphInterface):
            @return if the removal was successful"""
 
         def remove_edge(self, key):
-            if self.edges.get(key) is not None:
-                self.edges.pop(key)
+            if self.edges is not None and key in self.edges:
+                del self.edges[key]
                 return True
 
             return False
@@ -52,8 +64,13 @@ class DiGraph(GraphInterface):
            @return if the connection was successful"""
 
         def add_revers_edge(self, key, weight):
-            if key != self.key and self.revers_edges.get(key) is None:
-                self.revers_edges.update([(key, weight)])
+            if key == self.key:
+                return False
+            if self.revers_edges is None:
+                self.revers_edges = {key: weight}
+                return True
+            if key not in self.revers_edges:
+                self.revers_edges[key] = weight
                 return True
 
             return False
@@ -62,8 +79,8 @@ class DiGraph(GraphInterface):
            @return if the removal was successful"""
 
         def remove_revers_edge(self, key):
-            if self.revers_edges.get(key) is not None:
-                self.revers_edges.pop(key)
+            if self.revers_edges is not None and key in self.revers_edges:
+                del self.revers_edges[key]
                 return True
 
             return False
@@ -72,28 +89,29 @@ class DiGraph(GraphInterface):
            @returns a dictionary of all the edges entering the node {src id<int>: edge weight<float>}"""
 
         def get_revers_edges(self):
+            if self.revers_edges is None:
+                return {}
             return self.revers_edges
 
-        """Return a list containing the ids of nodes, mainly for algorithmic purposes
+        """Return a list containing the ids of nodes
            @:return a list containing the ids of nodes"""
 
         def get_path(self):
+            if self.path is None:
+                self.path = list()
             return self.path
 
-        """Sets a new path list to the node, mainly for algorithmic purposes
+        """Sets a new path list to the node
            @param path: the new list, if is empty resets the path"""
 
         def set_path(self, path=None):
-            if path is None:
-                self.path = list()
-            else:
-                self.path = path
+            self.path = path
 
         """Appends the path list with the new key
            @param key: the key of the new node"""
 
         def append_path(self, key):
-            self.path.append(key)
+            self.get_path().append(key)
 
 #################################Getters_and_Setters###########################################################
 
@@ -101,31 +119,29 @@ class DiGraph(GraphInterface):
         def get_key(self):
             return self.key
 
-        def get_weight(self):
-            return self.weight
-
-        def set_weight(self, weight):
-            self.weight = weight
-
-        def get_tag(self):
-            return self.tag
-
-        def set_tag(self, tag):
-            self.tag = tag
+        """Return the position of the node, a lazily loaded node keeps the graph's PositionTable
+           instead of its own position and the position is looked up there
+           @return a tuple (x, y, z), or None if the node has no position"""
 
         def get_pos(self):
-            return self.pos
+            pos = self.pos
+            if type(pos) is PositionTable:
+                return pos.get(self.key)
+            return pos
 
         def set_pos(self, pos):
             self.pos = pos
+            if self.graph is not None:
+                self.graph.node_moved(self.key)
 
         """Return a list containing dictionaries of edges
            @return a list containing dictionaries of edges"""
 
         def get_edge_list(self):
             edge_list = []
-            for e in self.edges:
-                edge_dict = {"src": self.key, "w": self.edges[e], "dest": e}
+            edges = self.get_edges()
+            for e in edges:
+                edge_dict = {"src": self.key, "w": edges[e], "dest": e}
                 edge_list.append(edge_dict)
 
             return edge_list
@@ -142,10 +158,11 @@ class DiGraph(GraphInterface):
                   @return a dictionary of the node's data"""
 
         def get_node(self):
-            if self.pos is None:
+            pos = self.get_pos()
+            if pos is None:
                 node_dict = {"id": self.key}
             else:
-                str_pos = "%.16lf,%.16lf,%.16lf" % (self.pos[0], self.pos[1], self.pos[2])
+                str_pos = "%.16lf,%.16lf,%.16lf" % (pos[0], pos[1], pos[2])
                 node_dict = {"pos": str_pos, "id": self.key}
 
             return node_dict
@@ -158,6 +175,8 @@ class DiGraph(GraphInterface):
         self.mc = 0
         self.ec = 0
         self.nodes = dict()
+        self.listeners = list()
+        self.moves = 0
 
     def e_size(self) -> int:
         return self.ec
@@ -185,18 +204,142 @@ class DiGraph(GraphInterface):
     def get_mc(self) -> int:
         return self.mc
 
+    """The lock of the move counters of all the graphs, moves are rare so one lock is enough"""
+
+    _moves_lock = threading.Lock()
+
+    """Count a move of one of the graph's nodes, called by Node.set_pos.
+       a move doesn't change mc, so the caches that only depend on the edges are kept,
+       the caches that depend on the positions (the A* bound) compare the moves too
+       @param node_id: the moved node"""
+
+    def node_moved(self, node_id: int):
+        with DiGraph._moves_lock:
+            self.moves += 1
+
+    """Register an object to be told about every change of the graph, after the change is made.
+       it must have the methods node_added(id), node_removed(id, out_edges, in_edges),
+       edge_added(id1, id2) and edge_removed(id1, id2), the edges of a removed node are only reported
+       through node_removed. with no listeners the changes cost nothing extra"""
+
+    def add_listener(self, listener):
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener):
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+
+    """Return the position of the node
+       @return a tuple (x, y, z), or None if the node has no position or doesn't exist"""
+
+    def get_node_pos(self, id1: int):
+        node = self.nodes.get(id1)
+        if node is not None:
+            return node.get_pos()
+
+    """Take an immutable compressed sparse row snapshot of the graph,
+       later changes to the graph are not seen by the snapshot
+       @return a CSRGraph with the graph's current nodes and edges"""
+
+    def freeze(self) -> CSRGraph:
+        return CSRGraph.from_graph(self)
+
     """Add a new node to the graph, if the node already exist does nothing.
        @return if the addition was successful"""
 
     def add_node(self, node_id: int, pos: tuple = None) -> bool:
         if self.nodes.get(node_id) is None:
-            node = self.Node(node_id, pos)
+            node = self.Node(node_id, pos, self)
             self.nodes.update([(node_id, node)])
             self.mc += 1
+            for listener in self.listeners:
+                listener.node_added(node_id)
             return True
 
         return False
 
+    """Add many nodes at once, nodes that already exist are skipped.
+       @param nodes: an iterable (or NumPy array) of node ids, or of (node id, pos) pairs
+       @return the number of nodes that were added"""
+
+    def add_nodes_from(self, nodes) -> int:
+        if hasattr(nodes, "tolist"):
+            nodes = nodes.tolist()
+        all_nodes = self.nodes
+        node_class = self.Node
+        listeners = self.listeners
+        added = 0
+
+        for node in nodes:
+            if type(node) is tuple:
+                node_id, pos = node
+            else:
+                node_id, pos = node, None
+            if node_id not in all_nodes:
+                all_nodes[node_id] = node_class(node_id, pos, self)
+                added += 1
+                if listeners:
+                    self.mc += added
+                    added = 0
+                    for listener in listeners:
+                        listener.node_added(node_id)
+
+        self.mc += added
+        return added
+
+    """Add many edges at once, with the same rules as add_edge: edges that already exist,
+       loops, non positive weights and edges with a missing node are skipped.
+       @param edges: an iterable of (src, dest, weight) triples or a NumPy array of shape (m, 3),
+                     or the src ids when dest and weight are given as well
+       @raise ValueError: if edges is an array of another shape
+       @param dest: an iterable (or NumPy array) of the dest ids, parallel to src
+       @param weight: an iterable (or NumPy array) of the weights, parallel to src
+       @return the number of edges that were added"""
+
+    def add_edges_from(self, edges, dest=None, weight=None) -> int:
+        if dest is None and hasattr(edges, "tolist"):
+            shape = getattr(edges, "shape", None)
+            if shape is None or len(shape) != 2 or shape[1] != 3:
+                raise ValueError("an array of edges must have the shape (m, 3), not %s" % (shape,))
+            edges, dest, weight = edges[:, 0].astype(int), edges[:, 1].astype(int), edges[:, 2]
+        if dest is not None:
+            edges = zip(*(a.tolist() if hasattr(a, "tolist") else a for a in (edges, dest, weight)))
+        get_node = self.nodes.get
+        listeners = self.listeners
+        added = 0
+
+        for id1, id2, w in edges:
+            if id1 == id2 or w <= 0:
+                continue
+            src = get_node(id1)
+            dest_node = get_node(id2)
+            if src is None or dest_node is None:
+                continue
+
+            out_edges = src.edges
+            if out_edges is None:
+                src.edges = {id2: w}
+            elif id2 in out_edges:
+                continue
+            else:
+                out_edges[id2] = w
+            in_edges = dest_node.revers_edges
+            if in_edges is None:
+                dest_node.revers_edges = {id1: w}
+            else:
+                in_edges[id1] = w
+            added += 1
+            if listeners:
+                self.ec += added
+                self.mc += added
+                added = 0
+                for listener in listeners:
+                    listener.edge_added(id1, id2)
+
+        self.ec += added
+        self.mc += added
+        return added
+
     """connects 2 nodes with an edge weighted as weight,
           when id1 is the src node and id2 is the dest
           @return if the addition was successful"""
@@ -211,6 +354,8 @@ class DiGraph(GraphInterface):
             if src.add_edge(id2, weight) and dest.add_revers_edge(id1, weight):
                 self.ec += 1
                 self.mc += 1
+                for listener in self.listeners:
+                    listener.edge_added(id1, id2)
                 return True
 
 
@@ -228,6 +373,8 @@ class DiGraph(GraphInterface):
             if src.remove_edge(node_id2) and dest.remove_revers_edge(node_id1):
                 self.ec -= 1
                 self.mc += 1
+                for listener in self.listeners:
+                    listener.edge_removed(node_id1, node_id2)
                 return True
 
 
@@ -251,6 +398,11 @@ class DiGraph(GraphInterface):
                 self.nodes.get(n).remove_edge(node_id)
 
             self.nodes.pop(node_id)
+            node.graph = None
+            if type(node.pos) is PositionTable:
+                node.pos.remove(node_id)
+            for listener in self.listeners:
+                listener.node_removed(node_id, edges, back_edges)
             return True
 
         return False
@@ -1,4 +1,5 @@
 import unittest
+import numpy as np
 from Ariel_OOP_2020.Assignments.Ex3.src.DiGraph import DiGraph
 
 
@@ -63,6 +64,41 @@ class MyTestCase(unittest.TestCase):
         self.assertEqual(graph.v_size(), 9)
 
 
+    def test_bulk_adding(self):
+        graph = DiGraph()
+        self.assertEqual(graph.add_nodes_from([0, 1, (2, (1.0, 2.0, 0.0)), 3, 1]), 4)
+        self.assertEqual(graph.get_node_pos(2), (1.0, 2.0, 0.0))
+        edges = [(0, 1, 1), (1, 2, 2.5), (1, 2, 7), (2, 2, 1), (0, 9, 1), (3, 0, -1), (2, 0, 4)]
+        self.assertEqual(graph.add_edges_from(edges), 3)
+        self.assertEqual(graph.e_size(), 3)
+        self.assertEqual(graph.get_mc(), 7)
+        self.assertEqual(graph.all_out_edges_of_node(1), {2: 2.5})
+        self.assertEqual(graph.all_in_edges_of_node(0), {2: 4})
+
+        single = DiGraph()
+        for n in range(4):
+            single.add_node(n, graph.get_node_pos(n))
+        for e in edges:
+            single.add_edge(*e)
+        self.assertEqual(repr(single), repr(graph))
+        self.assertEqual(single.get_mc(), graph.get_mc())
+
+    def test_bulk_adding_numpy(self):
+        graph = DiGraph()
+        self.assertEqual(graph.add_nodes_from(np.arange(5)), 5)
+        src = np.array([0, 1, 2, 3])
+        dest = np.array([1, 2, 3, 4])
+        self.assertEqual(graph.add_edges_from(src, dest, np.array([1.5, 2.0, 2.5, 3.0])), 4)
+        self.assertEqual(graph.add_edges_from(np.array([[4, 0, 1.0], [0, 1, 9.0]])), 1)
+        mc = graph.get_mc()
+        for bad in [np.array([4, 0, 1.0]), np.array([[4, 0], [0, 1]]), np.zeros((2, 3, 1))]:
+            with self.assertRaises(ValueError):
+                graph.add_edges_from(bad)
+        self.assertEqual(graph.get_mc(), mc)
+        self.assertEqual(graph.all_out_edges_of_node(4), {0: 1.0})
+        self.assertEqual(type(list(graph.all_out_edges_of_node(0))[0]), int)
+        self.assertEqual(graph.e_size(), 5)
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -1,24 +1,93 @@
-import json
+import math
+import os
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from GraphInterface import GraphInterface
 from GraphAlgoInterface import GraphAlgoInterface
 from DiGraph import DiGraph
+from CSRGraph import CSRGraph
+from PathCache import PathCache
+from ShortestPathTree import ShortestPathTree
+from Landmarks import Landmarks
+from ContractionHierarchy import ContractionHierarchy
+from SCCIndex import SCCIndex, strong_components
+import SparseGraph
+import GraphPlot
+from PositionTable import PositionTable
+import Instrumentation
+import PointSearch
+from GraphJson import JsonStream, parse_pos, open_json, write_graph, graph_edges, graph_nodes
 from typing import List
 import random
+import time
+import numpy as np
 from matplotlib import pyplot as plt
+from matplotlib.figure import Figure
+
+"""The snapshot and targets every worker process of distance_matrix searches"""
+
+_worker_graph = None
+_worker_targets = None
+
+
+def _init_worker(graph, targets):
+    global _worker_graph, _worker_targets
+    _worker_graph = graph
+    _worker_targets = targets
+
+
+"""Calculate one row of the distance matrix in a worker process
+   @return a list of the distances from src to every target"""
+
+
+def _distance_row(src):
+    return _distances(_worker_graph, src, _worker_targets)
+
+
+def _distances(graph, src, targets):
+    nodes = graph.get_all_v()
+    if nodes.get(src) is None:
+        return [float('inf')] * len(targets)
+    tree = ShortestPathTree(graph, src)
+    return [tree.distance(t) if nodes.get(t) is not None else float('inf') for t in targets]
+
 
 """A class containing functions to manipulate and present the DiGraphs data"""
 
 
 class GraphAlgo(GraphAlgoInterface):
-    """Initialize the GraphAlgo class with the given graph.
-       @param graph: the that we will work on, if is None create a default empty graph"""
+    PATH_METHODS = ("dijkstra", "bidirectional", "astar", "alt", "ch")
+    BACKENDS = ("python", "numpy")
 
-    def __init__(self, graph=None):
+    """Initialize the GraphAlgo class with the given graph.
+       @param graph: the that we will work on, if is None create a default empty graph
+       @param cache_size: how many single source shortest path trees to keep, 0 disables the cache
+       @param backend: "python" to run the algorithms on the graph itself, or "numpy" to run
+                       connected_component(s) and distance_matrix on a SciPy sparse matrix of the graph,
+                       made when first needed and again after the graph changes (needs scipy).
+                       both give the same results"""
+
+    def __init__(self, graph=None, cache_size: int = 8, backend: str = "python"):
+        if backend not in self.BACKENDS:
+            raise ValueError("unknown backend %s" % backend)
+        if backend == "numpy" and not SparseGraph.AVAILABLE:
+            raise ImportError("the numpy backend needs scipy")
         if graph is None:
             self.graph = DiGraph()
 
         else:
             self.graph = graph
+        self.path_cache = PathCache(cache_size)
+        self._ratio_cache = (None, None, None, None)
+        self._landmarks = None
+        self._landmark_count = 8
+        self._ch = None
+        self._scc = None
+        self.backend = backend
+        self._sparse = None
+        self._stats = None
+        self.last_stats = None
 
     """Return the current graph
        @return the current graph"""
@@ -26,32 +95,40 @@ class GraphAlgo(GraphAlgoInterface):
     def get_graph(self) -> GraphInterface:
         return self.graph
 
-    """Load a graph from a Json file
+    """Load a graph from a Json file,
+       the file is parsed element by element and every node and edge is inserted as soon as it is read.
+       edges that appear before the nodes are kept in compact arrays until the nodes are loaded.
+       a file name ending with .gz is read as a gzip compressed file
+       @param lazy_pos: keep the nodes' position strings in one PositionTable that the nodes share and decode
+                        them only when a position is first asked for (by Node.get_pos, A*, plot_graph, saving...),
+                        False parses them while loading into a tuple on every node
        @return if the loading was successful"""
 
-    def load_from_json(self, file_name: str) -> bool:
+    def load_from_json(self, file_name: str, lazy_pos: bool = True) -> bool:
         try:
-            with  open(file_name, "r") as json_file:
-                info = json_file.read()
-                ans = True
-                if info.find("pos") < 0:
-                    ans = False
-
+            with open_json(file_name, "r") as json_file:
                 new_graph = DiGraph()
-                graph_dict = json.loads(info)
-
-            nodes = graph_dict["Nodes"]
-            for node in nodes:
-                if ans:
-                    str_pos = node["pos"]
-                    pos = tuple(map(float, str_pos.split(',')))
-                    new_graph.add_node(node["id"], pos)
-                else:
-                    new_graph.add_node(node["id"])
-
-            edges = graph_dict["Edges"]
-            for edge in edges:
-                new_graph.add_edge(edge["src"], edge["dest"], edge["w"])
+                loaded_nodes = False
+                src = array('q')
+                dest = array('q')
+                weights = list()
+
+                for key, items in JsonStream(json_file).members():
+                    if key == "Nodes" and lazy_pos:
+                        new_graph.add_nodes_from(self._kept_positions(items, PositionTable()))
+                        loaded_nodes = True
+                    elif key == "Nodes":
+                        new_graph.add_nodes_from((node["id"], parse_pos(node)) for node in items)
+                        loaded_nodes = True
+                    elif key == "Edges" and loaded_nodes:
+                        new_graph.add_edges_from((edge["src"], edge["dest"], edge["w"]) for edge in items)
+                    elif key == "Edges":
+                        for edge in items:
+                            src.append(edge["src"])
+                            dest.append(edge["dest"])
+                            weights.append(edge["w"])
+
+            new_graph.add_edges_from(src, dest, weights)
 
             self.graph = new_graph
             return True
@@ -59,14 +136,54 @@ class GraphAlgo(GraphAlgoInterface):
         except IOError:
             return False
 
-    """Save the graph info to a json file for later use
+    """Iterate over the nodes as (id, table) pairs, or ids if they have no position,
+       putting their position strings in the table on the way"""
+
+    @staticmethod
+    def _kept_positions(nodes, table: PositionTable):
+        add = table.add
+        for node in nodes:
+            str_pos = node.get("pos")
+            if str_pos is None:
+                yield node["id"]
+            elif add(node["id"], str_pos):
+                yield node["id"], table
+            else:
+                yield node["id"]
+
+    """Save the graph info to a json file for later use,
+       the file is written a chunk of edges and nodes at a time instead of as one big string.
+       a file name ending with .gz is written gzip compressed
        @param file_name: the path to the file from the root"""
 
     def save_to_json(self, file_name: str) -> bool:
         try:
-            with  open(file_name, "w") as json_file:
-                info = repr(self.graph)
-                json_file.write(info)
+            with open_json(file_name, "w") as json_file:
+                write_graph(json_file, graph_edges(self.graph), graph_nodes(self.graph))
+            return True
+
+        except IOError:
+            return False
+
+    """Save a compressed sparse row snapshot of the graph to a binary file
+       @param file_name: the path to the file from the root
+       @return if the saving was successful"""
+
+    def save_binary(self, file_name: str) -> bool:
+        try:
+            self.graph.freeze().save(file_name)
+            return True
+
+        except IOError:
+            return False
+
+    """Load a graph saved by save_binary, the loaded graph is a read only CSRGraph,
+       by default the file is memory mapped so no node objects are created and loading is immediate
+       @return if the loading was successful"""
+
+    def load_binary(self, file_name: str, use_mmap: bool = True) -> bool:
+        try:
+            self.graph = CSRGraph.load(file_name, use_mmap)
             return True
 
         except IOError:
@@ -74,117 +191,338 @@ class GraphAlgo(GraphAlgoInterface):
 
     """Calculate the distance and path from id1 to id2
        if there is no path return float('inf') and empty list
-       utilizes the Dijkstra algorithms
+       utilizes the Dijkstra algorithms, the search from id1 is kept in an LRU cache as long as
+       the graph's mc doesn't change, so a repeated query from the same source only continues that search
+       @param method: "dijkstra" for the cached search from id1,
+                      "bidirectional" to search from id1 over the out edges and from id2 over the in edges
+                      until the two searches meet,
+                      "astar" to guide the search with the straight line distance between the nodes' positions,
+                      falls back to "dijkstra" when some node has no position,
+                      "alt" for A* with the landmark distance tables of preprocess_landmarks
+                      (made with the last k, or 8, if they are missing or the graph changed),
+                      "ch" for the contraction hierarchies index of preprocess_ch (built in memory if it is
+                      missing or the graph changed)
        @return the path distance and a list of the nodes' ids"""
 
-    def shortest_path(self, id1: int, id2: int) -> (float, list):
+    def shortest_path(self, id1: int, id2: int, method: str = "dijkstra") -> (float, list):
         nodes = self.graph.get_all_v()
-        path = list()
-        dist = 0
 
-        if nodes.get(id1) is not None and nodes.get(id2) is not None:
-            if id1 == id2:
-                path.append(id1)
+        if method not in self.PATH_METHODS:
+            raise ValueError("Unknown shortest path method %r" % method)
+        if nodes.get(id1) is None or nodes.get(id2) is None:
+            return float('inf'), list()
+        if id1 == id2:
+            return 0, [id1]
+
+        stats = self._stats
+        if method == "bidirectional":
+            dist, path, settled = PointSearch.bidirectional(self.graph, id1, id2, stats)
+            return dist, path
+        if method == "astar":
+            start = time.perf_counter()
+            ratio = self._weight_ratio()
+            if stats is not None:
+                stats.setup_seconds += time.perf_counter() - start
+            if ratio is not None:
+                get_pos = self.graph.get_node_pos
+                dest_pos = get_pos(id2)
+                dist, path, settled = PointSearch.astar(self.graph, id1, id2,
+                                                        lambda key: ratio * math.dist(get_pos(key), dest_pos), stats)
                 return dist, path
-
-            que = list()
-            self._clear_weight()
-            path.append(id1)
-            src = nodes.get(id1)
-            src.set_path(path)
-            que.append(src)
-
-            while len(que) > 0:
-                que.sort(key=DiGraph.Node.get_weight)
-                node = que.pop(0)
-                if id2 == node.get_key():
-                    path = node.get_path()
-                    dist = node.get_weight()
-                    return dist, path
-
-                edges = node.get_edges()
-                for edge in edges:
-                    dist = node.get_weight() + edges[edge]
-                    ni = nodes[edge]
-                    if ni.get_key() != id1 and (ni.get_weight() == 0 or dist < ni.get_weight()):
-                        if dist < ni.get_weight() and ni in que:
-                            que.remove(ni)
-                        temp_path = node.get_path().copy()
-                        temp_path.append(edge)
-                        ni.set_weight(dist)
-                        ni.set_path(temp_path)
-                        que.append(ni)
-
-        path = list()
-        dist = float('inf')
-        return dist, path
+        if method == "alt":
+            if self._landmarks is None or not self._landmarks.is_valid(self.graph):
+                seconds = self.preprocess_landmarks(self._landmark_count)
+                if stats is not None:
+                    stats.setup_seconds += seconds
+            dist, path, settled = PointSearch.astar(self.graph, id1, id2, self._landmarks.heuristic(id2), stats)
+            return dist, path
+        if method == "ch":
+            if self._ch is None or not self._ch.is_valid(self.graph):
+                seconds = self.preprocess_ch()
+                if stats is not None:
+                    stats.setup_seconds += seconds
+            dist, path, settled = self._ch.query(id1, id2, stats)
+            if len(path) > 0:
+                dist = PointSearch.path_length(self.graph, path)
+            return dist, path
+
+        if stats is None:
+            tree = self.path_cache.get(self.graph, id1)
+            return tree.distance(id2), tree.path(id2)
+        return self._counted_tree_query(stats, id1, [id2], True)
+
+    """Choose k landmarks and calculate the distance tables that the "alt" shortest path method uses,
+       the tables are dropped when the graph or its mc changes
+       @param k: the number of landmarks
+       @return the number of seconds the preprocessing took"""
+
+    def preprocess_landmarks(self, k: int = 8) -> float:
+        self._landmark_count = k
+        self._landmarks = Landmarks(self.graph, k)
+        return self._landmarks.seconds
+
+    """Make the contraction hierarchies index that the "ch" shortest path method uses.
+       with a file name, an index saved there for a graph with the same nodes and edges (see the fingerprint) is loaded
+       instead of built, and a newly built index is saved there, e.g. next to the graph's json file as file + ".ch"
+       @param file_name: the index file, if None the index is only kept in memory
+       @return the number of seconds the loading or building took"""
+
+    def preprocess_ch(self, file_name: str = None) -> float:
+        start = time.perf_counter()
+        self._ch = None
+        if file_name is not None and os.path.exists(file_name):
+            ch = ContractionHierarchy.load(file_name)
+            if ch.attach(self.graph):
+                self._ch = ch
+        if self._ch is None:
+            self._ch = ContractionHierarchy.build(self.graph)
+            if file_name is not None:
+                self._ch.save(file_name)
+        return time.perf_counter() - start
+
+    """Return the A* weight to distance ratio of the graph, computed once for every version of the graph
+       and again after a node of the graph was moved (see DiGraph.node_moved)
+       @return the ratio, or None if some node has no position"""
+
+    def _weight_ratio(self):
+        graph, mc, moves, ratio = self._ratio_cache
+        now = (self.graph.get_mc(), getattr(self.graph, "moves", 0))
+        if graph is not self.graph or (mc, moves) != now:
+            ratio = PointSearch.min_weight_ratio(self.graph)
+            self._ratio_cache = (self.graph,) + now + (ratio,)
+        return ratio
+
+    """Calculate the distances from src to all the nodes, or to the given targets, with a single search.
+       the search stops once every target is settled, the paths are only built when asked for
+       @param src: the source node id
+       @param targets: an iterable of node ids, if None all the nodes reachable from src
+       @return a dictionary {node id<int>: distance<float>} (float('inf') for targets that can't be reached)
+               and the ShortestPathTree of the search, tree.path(id) gives the path to a node"""
+
+    def shortest_paths_from(self, src: int, targets=None) -> (dict, ShortestPathTree):
+        if self.graph.get_all_v().get(src) is None:
+            return dict(), None
+
+        stats = self._stats
+        if stats is not None:
+            return self._counted_tree_query(stats, src, targets, False)
+        tree = self.path_cache.get(self.graph, src)
+        if targets is None:
+            tree.search()
+            return dict(tree.dist), tree
+
+        distances = dict()
+        for t in targets:
+            distances[t] = tree.distance(t)
+        return distances, tree
+
+    """Calculate the distances from every source to every target.
+       every source is one Dijkstra search, the searches are spread over a pool of processes
+       that all get one compact CSR snapshot of the graph when they start instead of a copy per search,
+       with one worker the searches run in this process on the graph itself
+       @param sources: the source node ids, if None all the nodes
+       @param targets: the target node ids, if None all the nodes
+       @param workers: the number of processes, if None one per cpu, 1 runs in this process.
+                       the numpy backend runs in this process with SciPy and ignores it
+       @return a NumPy array [len(sources), len(targets)], float('inf') where there is no path"""
+
+    def distance_matrix(self, sources=None, targets=None, workers: int = None) -> np.ndarray:
+        nodes = self.graph.get_all_v()
+        sources = list(nodes) if sources is None else list(sources)
+        targets = list(nodes) if targets is None else list(targets)
+        if self.backend == "numpy":
+            return self._sparse_graph().distances(sources, targets)
+        if workers is None:
+            workers = os.cpu_count() or 1
+        workers = min(workers, len(sources))
+
+        if workers <= 1:
+            rows = [_distances(self.graph, src, targets) for src in sources]
+        else:
+            snapshot = self.graph.freeze()
+            chunk = max(1, len(sources) // (workers * 4))
+            with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(snapshot, targets)) as pool:
+                rows = list(pool.map(_distance_row, sources, chunksize=chunk))
+
+        matrix = np.array(rows, dtype=np.float64)
+        return matrix.reshape(len(sources), len(targets))
+
+    """The instrumented version of the cached tree queries of shortest_path and shortest_paths_from,
+       the setup is the cache lookup, that also drops the old trees when the graph changed
+       @return what shortest_path (with one target and path True) or shortest_paths_from would"""
+
+    def _counted_tree_query(self, stats, src, targets, path: bool):
+        start = time.perf_counter()
+        tree = self.path_cache.get(self.graph, src)
+        stats.setup_seconds += time.perf_counter() - start
+        pushes = tree.pushes
+        pops = tree.pops
+        settled = len(tree.settled)
+        relaxed = tree.relaxed
+        if targets is None:
+            tree.search()
+            result = dict(tree.dist), tree
+        else:
+            result = {t: tree.distance(t) for t in targets}, tree
+        stats.heap_pushes += tree.pushes - pushes
+        stats.heap_pops += tree.pops - pops
+        stats.settled += len(tree.settled) - settled
+        stats.relaxed += tree.relaxed - relaxed
+        if not path:
+            return result
+        start = time.perf_counter()
+        result = result[0][targets[0]], tree.path(targets[0])
+        stats.path_seconds += time.perf_counter() - start
+        return result
+
+    """Count and time the calls of shortest_path, shortest_paths_from, connected_component and
+       connected_components, the counters of the last call are kept in last_stats (a CallStats,
+       see Instrumentation) and passed to the callback. the searches count into this GraphAlgo's stats only,
+       the graph is left as it is, so other users of the same graph aren't counted.
+       it is meant for one thread at a time
+       @param enable: False turns it off and restores the plain methods
+       @param callback: a function of the CallStats called after every call, or None
+       @param allocations: also trace the peak allocated bytes of every call with tracemalloc (slow)"""
+
+    def instrument(self, enable: bool = True, callback=None, allocations: bool = False):
+        for name in Instrumentation.INSTRUMENTED:
+            self.__dict__.pop(name, None)
+        if not enable:
+            return
+        for name in Instrumentation.INSTRUMENTED:
+            setattr(self, name, Instrumentation.instrumented(self, name, getattr(self, name), callback, allocations))
+
+    """Return the hit, miss, eviction and invalidation counts of the shortest path cache
+       @return a dictionary of the counters"""
+
+    def get_cache_stats(self) -> dict:
+        return self.path_cache.stats()
 
     """Return a list of all the connected nodes of the given node
-       utilizes the Kosaraju algorithm
+       utilizes the Kosaraju algorithm, a forward BFS over the out edges and a backward BFS over the in edges
+       limited to the nodes the first one reached. nodes are marked when queued so each is queued once
        @return a list of all the connected nodes of the given node"""
 
     def connected_component(self, id1: int) -> list:
+        scc = self._components_index()
+        if scc is not None:
+            return scc.component(id1)
+        if self.backend == "numpy":
+            return self._sparse_graph().component(id1)
         comp = list()
         nodes = self.graph.get_all_v()
+        out_edges = self.graph.all_out_edges_of_node
+        in_edges = self.graph.all_in_edges_of_node
+        if self._stats is not None:
+            out_edges = Instrumentation.counted(out_edges, self._stats)
+            in_edges = Instrumentation.counted(in_edges, self._stats)
 
         if nodes.get(id1) is None:
             return comp
-        que = list()
-        que.append(nodes[id1])
-        self._clear_tag()
+        tag = {id1: 1}
+        que = deque()
+        que.append(id1)
 
         while len(que) != 0:
-            node = que.pop(0)
-            node.set_tag(1)
-            edges = node.get_edges()
+            key = que.popleft()
+            edges = out_edges(key)
 
             for edge in edges:
-                if nodes[edge].get_tag() == 0:
-                    que.append(nodes[edge])
-        que.append(nodes[id1])
+                if edge not in tag:
+                    tag[edge] = 1
+                    que.append(edge)
+        tag[id1] = 2
+        que.append(id1)
 
         while len(que) != 0:
-            node = que.pop(0)
-            node.set_weight(1)
-            node.set_tag(2)
+            key = que.popleft()
 
-            revers_edges = node.get_revers_edges()
+            revers_edges = in_edges(key)
             for e in revers_edges:
-                if nodes[e].get_tag() == 1:
-                    que.append(nodes[e])
+                if tag.get(e) == 1:
+                    tag[e] = 2
+                    que.append(e)
 
         for n in nodes:
-            if nodes[n].get_tag() == 2:
+            if tag.get(n) == 2:
                 comp.append(n)
 
         return comp
 
     """Return a list of lists of all the connected components
-       utilizes the Kosaraju algorithm
+       utilizes an iterative version of Tarjan's algorithm, every node and edge is visited once.
+       the components are ordered by their first node and each one keeps the graph's node order
        @return a list of lists of all the connected components"""
 
     def connected_components(self) -> List[list]:
+        scc = self._components_index()
+        if scc is not None:
+            return scc.components()
+        if self.backend == "numpy":
+            return self._sparse_graph().components()
         comps = list()
         nodes = self.graph.get_all_v()
 
         if len(nodes) == 0:
             return comps
-        self._clear_weight()
-
+        out_edges = self.graph.all_out_edges_of_node
+        if self._stats is not None:
+            out_edges = Instrumentation.counted(out_edges, self._stats)
+        comp_of = dict()
+        for comp in strong_components(nodes, out_edges):
+            for n in comp:
+                comp_of[n] = comp[-1]
+
+        groups = dict()
         for n in nodes:
-            node = nodes[n]
-            if node.get_weight() != 1:
-                com = self.connected_component(n)
-                comps.append(com)
+            groups.setdefault(comp_of[n], []).append(n)
+        comps.extend(groups.values())
 
         return comps
 
-    """Present the graph in a GUI window, utilizes the matplotlib"""
-
-    def plot_graph(self) -> None:
-        max_x, max_y, min_x, min_y = self._set_positions()
-
-        nodes = self.graph.get_all_v()
+    """Keep the connected components up to date while the graph changes instead of computing them
+       on every call, see SCCIndex. after this connected_components only groups the nodes and
+       connected_component(id1) takes the size of the component, with its nodes sorted by id
+       @param enable: False stops the tracking"""
+
+    def track_components(self, enable: bool = True):
+        if self._scc is not None and hasattr(self._scc.graph, "remove_listener"):
+            self._scc.graph.remove_listener(self._scc)
+        self._scc = None
+        if enable:
+            self._scc = SCCIndex(self.graph)
+            if hasattr(self.graph, "add_listener"):
+                self.graph.add_listener(self._scc)
+
+    """Return the tracked components' index, rebuilt if the graph was replaced or changed without telling it
+       @return an SCCIndex, or None if the components aren't tracked"""
+
+    def _components_index(self):
+        if self._scc is not None and not self._scc.is_valid(self.graph):
+            self.track_components()
+        return self._scc
+
+    """Return the sparse matrix of the graph for the numpy backend, made again if the graph changed
+       @return a SparseGraph of the current graph"""
+
+    def _sparse_graph(self):
+        if self._sparse is None or not self._sparse.is_valid(self.graph):
+            self._sparse = SparseGraph.SparseGraph(self.graph)
+        return self._sparse
+
+    """Present the graph in a GUI window, or save it to an image file, utilizes the matplotlib.
+       the nodes and the edges are drawn as a few collections so big graphs are drawn in seconds,
+       see GraphPlot for the culling of hidden edges, the sampling above max_edges and the label thinning
+       @param file_name: a .png, .svg (or any format matplotlib writes) file to save the plot to instead of
+                         showing it, the figure is drawn off screen so no display is needed
+       @param labels: write the nodes' ids
+       @param max_edges: the most edges drawn
+       @param dpi: the resolution of the saved image
+       @return a dictionary of what was drawn, see GraphPlot.draw"""
+
+    def plot_graph(self, file_name: str = None, labels: bool = True, max_edges: int = GraphPlot.MAX_EDGES,
+                   dpi: int = 100) -> dict:
+        max_x, max_y, min_x, min_y, fallback = self._set_positions()
 
         if min_x == max_x:
             if min_x == 0:
@@ -197,50 +535,31 @@ class GraphAlgo(GraphAlgoInterface):
                 max_y = 1
             else:
                 min_y *= 0.9
-        fig, ax = plt.subplots(figsize=(6, 6))
+        if file_name is None:
+            fig, ax = plt.subplots(figsize=(6, 6), dpi=dpi)
+        else:
+            fig = Figure(figsize=(6, 6), dpi=dpi)
+            ax = fig.subplots()
         r = min(max_x - min_x, max_y - min_y) / 80
+        margin = r * 10
+        ax.axis([min_x - margin, max_x + margin, min_y - margin, max_y + margin])
 
-        for n in nodes:
-            node = nodes[n]
-            pos = node.get_pos()
-            circle = plt.Circle((pos[0], pos[1]), r)
-            ax.add_artist(circle)
-            ax.text(pos[0], pos[1], n)
-
-            edges = node.get_edges()
-            for e in edges:
-                dest = nodes[e]
-                dest_pos = dest.get_pos()
-                ax.annotate("", xy=(dest_pos[0], dest_pos[1]), xycoords='data',
-                            xytext=(pos[0], pos[1]), textcoords='data',
-                            arrowprops=dict(arrowstyle="->", connectionstyle="arc3"), )
-
-        r *= 10
-        ax.axis([min_x - r, max_x + r, min_y - r, max_y + r])
-        plt.show()
+        ids, xy, src, dest = GraphPlot.graph_arrays(self.graph, fallback)
+        drawn = GraphPlot.draw(ax, ids, xy, src, dest, r, labels, max_edges)
+        if file_name is None:
+            plt.show()
+        else:
+            fig.savefig(file_name)
+        return drawn
 
     def __repr__(self):
         return repr(self.graph)
 
-    """Sets all node's weight to 0"""
-
-    def _clear_weight(self):
-        nodes = self.graph.get_all_v()
-
-        for n in nodes:
-            nodes[n].set_weight(0)
-
-    """Set all the node's tag to 0"""
-
-    def _clear_tag(self):
-        nodes = self.graph.get_all_v()
-
-        for n in nodes:
-            nodes[n].set_tag(0)
-
     """Calculate the range of axis for the plot
-          if the nodes lack position create a random position in the range of current nodes
-          @return min_x and max_x for the x axis, min_y and max_y for the y axis"""
+          if the nodes lack position create a random position in the range of current nodes,
+          the graph isn't changed, the random positions are only used for the plot
+          @return min_x and max_x for the x axis, min_y and max_y for the y axis
+                  and a dictionary of the random (x, y) of every node without a position"""
 
     def _set_positions(self):
         nodes = self.graph.get_all_v()
@@ -250,9 +569,9 @@ class GraphAlgo(GraphAlgoInterface):
         max_y = -float('inf')
         min_y = float('inf')
 
+        get_pos = self.graph.get_node_pos
         for n in nodes:
-            node = nodes[n]
-            pos = node.get_pos()
+            pos = get_pos(n)
             if pos is not None:
                 max_x = max(max_x, pos[0])
                 min_x = min(min_x, pos[0])
@@ -265,13 +584,11 @@ class GraphAlgo(GraphAlgoInterface):
             max_y = len(nodes)
             min_y = 0
 
+        fallback = dict()
         for n in nodes:
-            node = nodes[n]
-            pos = node.get_pos()
-            if pos is None:
+            if get_pos(n) is None:
                 x = random.uniform(min_x, max_x)
                 y = random.uniform(min_y, max_y)
-                new_pos = (x, y, 0)
-                node.set_pos(new_pos)
+                fallback[n] = (x, y)
 
-        return max_x, max_y, min_x, min_y
+        return max_x, max_y, min_x, min_y, fallback
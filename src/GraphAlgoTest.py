@@ -1,7 +1,11 @@
+import random
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 import networkx as nx
+import numpy as np
 from DiGraph import DiGraph
 from GraphAlgo import GraphAlgo
+import PointSearch
 from Comper import Networkx
 
 
@@ -62,6 +66,19 @@ class MyTestCase(unittest.TestCase):
                 self.assertEqual(node, nx_node)
 
 
+    def test_connected_components_deep(self):
+        g = DiGraph()
+        for i in range(20000):
+            g.add_node(i)
+        for i in range(19999):
+            g.add_edge(i, i + 1, 1)
+        g.add_edge(19999, 10000, 1)
+        ga = GraphAlgo(g)
+        comps = ga.connected_components()
+        self.assertEqual(len(comps), 10001)
+        self.assertEqual(comps[:3], [[0], [1], [2]])
+        self.assertEqual(comps[10000], list(range(10000, 20000)))
+
     def test_shortest_path(self):
         g = DiGraph()
         for i in range(10):
@@ -104,6 +121,126 @@ class MyTestCase(unittest.TestCase):
 
 
 
+    def test_shortest_path_chain(self):
+        g = DiGraph()
+        for i in range(5000):
+            g.add_node(i)
+        for i in range(4999):
+            g.add_edge(i, i + 1, 2)
+        ga = GraphAlgo(g)
+        dist, path = ga.shortest_path(0, 4999)
+        self.assertEqual(dist, 9998)
+        self.assertEqual(path, list(range(5000)))
+
+        dist, path = ga.shortest_path(4999, 0)
+        self.assertEqual(dist, float('inf'))
+        self.assertEqual(path, [])
+
+    def test_parallel_queries(self):
+        ga = GraphAlgo()
+        ga.load_from_json('../data/G_1000_8000_0.json')
+        pairs = [(i, 999 - i) for i in range(0, 400, 7)]
+        expected = [ga.shortest_path(id1, id2) for id1, id2 in pairs]
+        expected_comp = ga.connected_component(3)
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            paths = list(pool.map(lambda p: ga.shortest_path(p[0], p[1]), pairs))
+            comps = list(pool.map(ga.connected_component, [3] * 8))
+        self.assertEqual(paths, expected)
+        for comp in comps:
+            self.assertEqual(comp, expected_comp)
+
+    def test_distance_matrix(self):
+        g = DiGraph()
+        for i in range(4):
+            g.add_node(i)
+        g.add_edge(0, 1, 1)
+        g.add_edge(1, 2, 2.5)
+        g.add_edge(2, 0, 1)
+        ga = GraphAlgo(g)
+        inf = float('inf')
+        g.freeze = None
+        matrix = ga.distance_matrix([0, 3, 9], [2, 0, 3], workers=1)
+        del g.freeze
+        self.assertEqual(matrix.tolist(), [[3.5, 0, inf], [inf, inf, 0], [inf, inf, inf]])
+
+        ga.load_from_json('../data/G_100_800_1.json')
+        matrix = ga.distance_matrix(workers=1)
+        self.assertEqual(matrix.shape, (100, 100))
+        self.assertEqual(matrix.tolist(), ga.distance_matrix(workers=2).tolist())
+        for i, j in [(3, 73), (5, 5), (40, 2)]:
+            self.assertEqual(matrix[i, j], ga.shortest_path(i, j)[0])
+
+    def test_distance_matrix_numpy_ids(self):
+        ga = GraphAlgo()
+        ga.load_from_json('../data/A0')
+        ids = np.arange(3)
+        matrix = ga.distance_matrix(ids, ids, workers=1)
+        self.assertEqual(matrix.tolist(), ga.distance_matrix([0, 1, 2], [0, 1, 2], workers=1).tolist())
+        self.assertEqual(matrix.tolist(), ga.distance_matrix(ids, ids, workers=2).tolist())
+        self.assertTrue(np.isfinite(matrix).all())
+
+    def test_shortest_path_methods(self):
+        ga = GraphAlgo()
+        for file in ['../data/A5', '../data/G_100_800_0.json', '../data/T0.json']:
+            ga.load_from_json(file)
+            keys = list(ga.get_graph().get_all_v())
+            random.seed(4)
+            pairs = [(random.choice(keys), random.choice(keys)) for i in range(30)] + [(keys[0], keys[0]), (0, -1)]
+            for id1, id2 in pairs:
+                dist, path = ga.shortest_path(id1, id2)
+                for method in GraphAlgo.PATH_METHODS:
+                    m_dist, m_path = ga.shortest_path(id1, id2, method=method)
+                    self.assertAlmostEqual(m_dist, dist)
+                    self.assertEqual(len(m_path) == 0, len(path) == 0)
+                    if len(path) > 0:
+                        self.assertEqual((m_path[0], m_path[-1]), (id1, id2))
+        with self.assertRaises(ValueError):
+            ga.shortest_path(0, 1, method="nope")
+
+    def test_astar(self):
+        g = DiGraph()
+        for i in range(5):
+            g.add_node(i, (i, 0, 0))
+        for i in range(4):
+            g.add_edge(i, i + 1, 2)
+        g.add_edge(0, 4, 10)
+        g.add_edge(4, 0, 1)
+        ga = GraphAlgo(g)
+        self.assertAlmostEqual(PointSearch.min_weight_ratio(g), 0.25)
+        self.assertEqual(ga.shortest_path(0, 4, method="astar"), (8, [0, 1, 2, 3, 4]))
+        self.assertEqual(ga.shortest_path(3, 1, method="astar"), (5, [3, 4, 0, 1]))
+
+        g.add_node(5)
+        g.add_edge(4, 5, 1)
+        self.assertIsNone(PointSearch.min_weight_ratio(g))
+        self.assertEqual(ga.shortest_path(3, 5, method="astar"), (3, [3, 4, 5]))
+
+    def test_astar_moved_node(self):
+        g = DiGraph()
+        for i in range(3):
+            g.add_node(i, (i, 0, 0))
+        g.add_edge(0, 1, 1)
+        g.add_edge(1, 2, 1)
+        g.add_edge(0, 2, 5)
+        ga = GraphAlgo(g, cache_size=0)
+        self.assertEqual(ga.shortest_path(0, 2, method="astar"), (2, [0, 1, 2]))
+        g.get_all_v()[1].set_pos((100, 0, 0))
+        self.assertEqual(ga.shortest_path(0, 2, method="astar"), (2, [0, 1, 2]))
+        self.assertEqual(g.moves, 1)
+
+        ratio = ga._ratio_cache
+        other = DiGraph()
+        other.add_node(0, (0, 0, 0))
+        other.get_all_v()[0].set_pos((1, 1, 0))
+        self.assertEqual((other.moves, g.moves), (1, 1))
+        ga._weight_ratio()
+        self.assertIs(ga._ratio_cache, ratio)
+        node = g.get_all_v()[2]
+        g.remove_node(2)
+        node.set_pos((7, 7, 0))
+        self.assertEqual(g.moves, 1)
+
     def test_save(self):
         g = DiGraph()
         for i in range(10):
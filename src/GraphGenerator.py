@@ -0,0 +1,151 @@
+import argparse
+import os
+import sys
+from array import array
+import numpy as np
+from CSRGraph import CSRGraph
+from GraphJson import open_json, write_graph
+
+"""A seeded generator of large random graphs like the data/G_{V}_{E}_{seed}.json files:
+   V nodes, E edges from uniformly drawn sources to uniformly drawn targets (so about E/V out edges per node)
+   and weights uniform in (0, MAX_WEIGHT]. with positions the nodes get random points in the unit square
+   and every weight is the straight line distance times a random factor, so A* bounds are useful.
+   loops are never drawn and the rare repeated edges are dropped, the way the loader would drop them,
+   so a file may hold a few edges less than E.
+   the edges are made a block of sources at a time and written right away, the same seed
+   gives the same graph in every format"""
+
+MAX_WEIGHT = 80.0
+DISTANCE_WEIGHT = 100.0
+BLOCK_SIZE = 1 << 16
+
+
+"""Return the name the generated file gets, e.g. G_1000_8000_0.json"""
+
+
+def file_name_of(v: int, e: int, seed: int = 0, binary: bool = False) -> str:
+    return "G_%d_%d_%d%s" % (v, e, seed, ".bin" if binary else ".json")
+
+
+"""Draw the graph a block of sources at a time
+   @param v: the number of nodes
+   @param e: the number of edges drawn
+   @param seed: the random seed
+   @param pos: give the nodes positions
+   @return the positions (an array [v, 3], or None) and an iterator of (src, dest, weight) NumPy arrays,
+           ordered by src then dest"""
+
+
+def generate_blocks(v: int, e: int, seed: int = 0, pos: bool = False):
+    rng = np.random.default_rng(seed)
+    positions = None
+    if pos:
+        positions = np.zeros((v, 3))
+        positions[:, :2] = rng.random((v, 2))
+    degrees = rng.multinomial(e, np.full(v, 1 / v)) if v > 1 else np.zeros(v, dtype=np.int64)
+    return positions, _blocks(rng, v, degrees, positions)
+
+
+def _blocks(rng, v, degrees, positions):
+    for start in range(0, v, BLOCK_SIZE):
+        counts = degrees[start:start + BLOCK_SIZE]
+        src = np.repeat(np.arange(start, start + len(counts), dtype=np.int64), counts)
+        if len(src) == 0:
+            continue
+        dest = rng.integers(0, v - 1, len(src))
+        dest += dest >= src
+        keys = np.unique(src * v + dest)
+        src = keys // v
+        dest = keys % v
+        if positions is None:
+            weight = MAX_WEIGHT * (1 - rng.random(len(src)))
+        else:
+            length = np.hypot(*(positions[dest, :2] - positions[src, :2]).T)
+            weight = np.maximum(DISTANCE_WEIGHT * length * (1 + rng.random(len(src))), 1e-9)
+        yield src, dest, weight
+
+
+"""Write a generated graph in the json format, streamed a block at a time
+   @param file_name: the path to the file (gzip compressed if it ends with .gz)
+   @return the number of edges written"""
+
+
+def write_json(file_name: str, v: int, e: int, seed: int = 0, pos: bool = False) -> int:
+    positions, blocks = generate_blocks(v, e, seed, pos)
+    written = [0]
+
+    def edges():
+        for src, dest, weight in blocks:
+            written[0] += len(src)
+            yield from ({"src": s, "w": w, "dest": d} for s, w, d in zip(src.tolist(), weight.tolist(), dest.tolist()))
+
+    def nodes():
+        if positions is None:
+            yield from ({"id": n} for n in range(v))
+        else:
+            for n, (x, y, z) in enumerate(positions.tolist()):
+                yield {"pos": "%.16lf,%.16lf,%.16lf" % (x, y, z), "id": n}
+
+    with open_json(file_name, "w") as json_file:
+        write_graph(json_file, edges(), nodes())
+    return written[0]
+
+
+"""Write a generated graph in the binary CSRGraph format, see CSRGraph.save.
+   the arrays are built a block at a time, about 12 bytes per edge, and written at the end
+   @param file_name: the path to the file
+   @return the number of edges written"""
+
+
+def write_binary(file_name: str, v: int, e: int, seed: int = 0, pos: bool = False) -> int:
+    positions, blocks = generate_blocks(v, e, seed, pos)
+    counts = np.zeros(v, dtype=np.int64)
+    targets = array('i')
+    weights = array('d')
+    for src, dest, weight in blocks:
+        counts += np.bincount(src, minlength=v)
+        targets.frombytes(dest.astype(np.int32).tobytes())
+        weights.frombytes(weight.astype(np.float64).tobytes())
+
+    ids = array('q')
+    ids.frombytes(np.arange(v, dtype=np.int64).tobytes())
+    offsets = array('i')
+    offsets.frombytes(np.concatenate(([0], np.cumsum(counts))).astype(np.int32).tobytes())
+    pos_array = None
+    if positions is not None:
+        pos_array = array('d')
+        pos_array.frombytes(positions.tobytes())
+    CSRGraph(ids, offsets, targets, weights, pos_array, 0, dense_ids=True).save(file_name)
+    return len(targets)
+
+
+"""Generate a graph file named like the data files
+   @param directory: where to write the file
+   @param binary: write the binary format instead of json
+   @return the path of the new file"""
+
+
+def generate(v: int, e: int, seed: int = 0, pos: bool = False, directory: str = ".", binary: bool = False) -> str:
+    file_name = os.path.join(directory, file_name_of(v, e, seed, binary))
+    if binary:
+        write_binary(file_name, v, e, seed, pos)
+    else:
+        write_json(file_name, v, e, seed, pos)
+    return file_name
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="write a random G_{V}_{E}_{seed} graph file")
+    parser.add_argument("v", type=int, help="the number of nodes")
+    parser.add_argument("e", type=int, help="the number of edges")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--pos", action="store_true", help="give the nodes positions")
+    parser.add_argument("--binary", action="store_true", help="write the binary format")
+    parser.add_argument("--dir", default=".")
+    args = parser.parse_args(argv)
+    print(generate(args.v, args.e, args.seed, args.pos, args.dir, args.binary))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
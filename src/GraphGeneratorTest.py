@@ -0,0 +1,59 @@
+import os
+import tempfile
+import unittest
+import GraphGenerator
+from GraphAlgo import GraphAlgo
+
+
+class MyTestCase(unittest.TestCase):
+
+    def test_json_and_binary(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            file = GraphGenerator.generate(500, 4000, 7, directory=tmp)
+            bin_file = GraphGenerator.generate(500, 4000, 7, directory=tmp, binary=True)
+            self.assertEqual(os.path.basename(file), 'G_500_4000_7.json')
+            self.assertEqual(os.path.basename(bin_file), 'G_500_4000_7.bin')
+            ga = GraphAlgo()
+            self.assertTrue(ga.load_from_json(file))
+            bin_ga = GraphAlgo()
+            self.assertTrue(bin_ga.load_binary(bin_file))
+            g = ga.get_graph()
+            self.assertEqual(g.v_size(), 500)
+            self.assertGreater(g.e_size(), 3950)
+            self.assertLessEqual(g.e_size(), 4000)
+            self.assertEqual(bin_ga.get_graph().e_size(), g.e_size())
+            for n in g.get_all_v():
+                self.assertEqual(bin_ga.get_graph().all_out_edges_of_node(n), g.all_out_edges_of_node(n))
+                self.assertNotIn(n, g.all_out_edges_of_node(n))
+                self.assertTrue(all(0 < w <= GraphGenerator.MAX_WEIGHT for w in g.all_out_edges_of_node(n).values()))
+                self.assertIsNone(g.get_node_pos(n))
+
+    def test_seeds(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            graphs = list()
+            for seed in [1, 1, 2]:
+                ga = GraphAlgo()
+                ga.load_from_json(GraphGenerator.generate(100, 800, seed, directory=tmp))
+                graphs.append(repr(ga.get_graph()))
+            self.assertEqual(graphs[0], graphs[1])
+            self.assertNotEqual(graphs[0], graphs[2])
+
+    def test_positions(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            ga = GraphAlgo()
+            ga.load_from_json(GraphGenerator.generate(300, 2400, pos=True, directory=tmp))
+            g = ga.get_graph()
+            x, y, z = g.get_node_pos(10)
+            self.assertTrue(0 <= x < 1 and 0 <= y < 1 and z == 0)
+            for id2 in range(0, 300, 30):
+                self.assertEqual(ga.shortest_path(10, id2, "astar"), ga.shortest_path(10, id2))
+
+    def test_small(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            ga = GraphAlgo()
+            ga.load_binary(GraphGenerator.generate(1, 5, directory=tmp, binary=True))
+            self.assertEqual((ga.get_graph().v_size(), ga.get_graph().e_size()), (1, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
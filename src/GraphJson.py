@@ -0,0 +1,201 @@
+import gzip
+import json
+from itertools import islice
+
+"""Incremental reading and writing of graph json files {"Edges": [...], "Nodes": [...]},
+   the file is read in chunks and the elements of the Nodes and Edges arrays are decoded one at a time,
+   so the whole text and the whole decoded dictionary never have to be in memory together.
+   writing works the same way, a few thousand elements are encoded and written at a time"""
+
+CHUNK_SIZE = 1 << 16
+WRITE_CHUNK = 4096
+
+
+class JsonStream:
+    """Wrap a text file opened for reading
+       @param json_file: the open file
+       @param chunk_size: how many characters to read each time the buffer runs out"""
+
+    def __init__(self, json_file, chunk_size=CHUNK_SIZE):
+        self.file = json_file
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    """Read the next chunk into the buffer, dropping what was already consumed
+       @return False if the file has ended"""
+
+    def _fill(self):
+        if self.eof:
+            return False
+        chunk = self.file.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    """Skip white spaces and return the next character without consuming it
+       @return the next character, or an empty string at the end of the file"""
+
+    def peek(self):
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in " \t\n\r":
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ""
+
+    """Consume the next character, which must be one of chars
+       @return the consumed character"""
+
+    def expect(self, chars):
+        ch = self.peek()
+        if ch == "" or ch not in chars:
+            raise ValueError("Expected one of %r at position %d, found %r" % (chars, self.pos, ch))
+        self.pos += 1
+        return ch
+
+    """Decode the next json value, reading more of the file if it isn't complete yet
+       @return the decoded value"""
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                val, end = self.decoder.raw_decode(self.buf, self.pos)
+                if end < len(self.buf) or self.eof:
+                    self.pos = end
+                    return val
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            if not self._fill():
+                val, self.pos = self.decoder.raw_decode(self.buf, self.pos)
+                return val
+
+    """Iterate over the elements of the json array that starts at the current position,
+       the elements are objects, all the complete ones in the buffer are decoded together in one call
+       and the element by element decoding is used only if that fails"""
+
+    def array(self):
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            close = self.buf.find("]", self.pos)
+            if close < 0:
+                close = len(self.buf)
+            end = self.buf.rfind("}", self.pos, close)
+            batch = None
+            if end >= 0:
+                try:
+                    batch = json.loads("[" + self.buf[self.pos:end + 1] + "]")
+                except json.JSONDecodeError:
+                    batch = None
+            if batch is not None:
+                self.pos = end + 1
+                yield from batch
+            elif end >= 0 or not self._fill():
+                yield self.value()
+            else:
+                continue
+            if self.expect(",]") == "]":
+                return
+
+    """Iterate over the members of the top level object,
+       yields (key, value) for every member, the value of Nodes and Edges is an iterator over the array
+       that must be consumed before the next member is read"""
+
+    def members(self):
+        self.expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(":")
+            if key in ("Nodes", "Edges") and self.peek() == "[":
+                yield key, self.array()
+            else:
+                yield key, self.value()
+            if self.expect(",}") == "}":
+                return
+
+
+"""Convert the "x,y,z" string of a node to a tuple of floats
+   @return the position tuple, or None if the node has no position"""
+
+
+def parse_pos(node: dict):
+    str_pos = node.get("pos")
+    if str_pos is None:
+        return None
+    return tuple(map(float, str_pos.split(',')))
+
+
+"""Open a graph json file, files whose name ends with .gz are gzip compressed
+   @param mode: "r" or "w"
+   @return the open text file"""
+
+
+def open_json(file_name: str, mode: str = "r"):
+    if file_name.endswith(".gz"):
+        return gzip.open(file_name, mode + "t", compresslevel=6)
+    return open(file_name, mode)
+
+
+"""Write a json array to the file a chunk of elements at a time,
+   the output is the same as json.dumps would give for the whole list"""
+
+
+def write_array(json_file, items):
+    items = iter(items)
+    json_file.write("[")
+    sep = ""
+    while True:
+        chunk = list(islice(items, WRITE_CHUNK))
+        if len(chunk) == 0:
+            break
+        json_file.write(sep)
+        json_file.write(json.dumps(chunk)[1:-1])
+        sep = ", "
+    json_file.write("]")
+
+
+"""Write a graph file {"Edges": [...], "Nodes": [...]} from iterables of edge and node dictionaries"""
+
+
+def write_graph(json_file, edges, nodes):
+    json_file.write('{"Edges": ')
+    write_array(json_file, edges)
+    json_file.write(', "Nodes": ')
+    write_array(json_file, nodes)
+    json_file.write("}")
+
+
+"""Iterate over the edges of a graph as {src, w, dest} dictionaries, in the graph's order"""
+
+
+def graph_edges(graph):
+    for n in graph.get_all_v():
+        edges = graph.all_out_edges_of_node(n)
+        for e in edges:
+            yield {"src": n, "w": edges[e], "dest": e}
+
+
+"""Iterate over the nodes of a graph as {pos, id} dictionaries ({id} if the node has no position)"""
+
+
+def graph_nodes(graph):
+    for n in graph.get_all_v():
+        pos = graph.get_node_pos(n)
+        if pos is None:
+            yield {"id": n}
+        else:
+            yield {"pos": "%.16lf,%.16lf,%.16lf" % (pos[0], pos[1], pos[2]), "id": n}
@@ -0,0 +1,74 @@
+import gzip
+import io
+import json
+import os
+import tempfile
+import unittest
+from GraphJson import JsonStream, parse_pos, write_array
+from DiGraph import DiGraph
+from GraphAlgo import GraphAlgo
+
+
+class MyTestCase(unittest.TestCase):
+
+    def test_members(self):
+        text = '{"Edges": [{"src": 0, "w": 1.5, "dest": 1}, {"src": 1, "w": 2, "dest": 0}],' \
+               ' "Other": {"a": [1, 2]}, "Nodes" : [ {"pos": "1.0,2.0,0.0", "id": 0} , {"id": 1} ] }'
+        for chunk_size in [1, 2, 3, 7, 64, 4096]:
+            found = dict()
+            for key, items in JsonStream(io.StringIO(text), chunk_size).members():
+                found[key] = list(items) if key in ("Nodes", "Edges") else items
+            self.assertEqual(found, json.loads(text))
+
+    def test_empty(self):
+        members = [(key, list(items)) for key, items in JsonStream(io.StringIO('{"Nodes": [], "Edges": []}'), 4).members()]
+        self.assertEqual(members, [("Nodes", []), ("Edges", [])])
+        self.assertEqual(list(JsonStream(io.StringIO(' {} ')).members()), [])
+
+    def test_bad_file(self):
+        with self.assertRaises(ValueError):
+            for key, items in JsonStream(io.StringIO('{"Nodes": [{"id": 0}, {"id": 1]}'), 5).members():
+                list(items)
+
+    def test_parse_pos(self):
+        self.assertEqual(parse_pos({"pos": "1.5,2,3", "id": 0}), (1.5, 2.0, 3.0))
+        self.assertIsNone(parse_pos({"id": 0}))
+
+    def test_same_as_json(self):
+        for file in ['../data/A0', '../data/T0.json', '../data/G_1000_8000_0.json']:
+            with open(file) as json_file:
+                graph_dict = json.load(json_file)
+            g = DiGraph()
+            for node in graph_dict["Nodes"]:
+                g.add_node(node["id"], parse_pos(node))
+            for edge in graph_dict["Edges"]:
+                g.add_edge(edge["src"], edge["dest"], edge["w"])
+            ga = GraphAlgo()
+            self.assertTrue(ga.load_from_json(file))
+            self.assertEqual(repr(ga.get_graph()), repr(g))
+
+    def test_write_array(self):
+        for n in [0, 1, 4095, 4096, 4097, 10000]:
+            items = [{"id": i, "w": i / 7} for i in range(n)]
+            out = io.StringIO()
+            write_array(out, iter(items))
+            self.assertEqual(out.getvalue(), json.dumps(items))
+
+    def test_save_gzip(self):
+        ga1 = GraphAlgo()
+        ga1.load_from_json('../data/A1')
+        with tempfile.TemporaryDirectory() as tmp:
+            file = os.path.join(tmp, 'A1.json')
+            self.assertTrue(ga1.save_to_json(file))
+            self.assertTrue(ga1.save_to_json(file + '.gz'))
+            with open(file) as json_file:
+                self.assertEqual(json_file.read(), repr(ga1))
+            with gzip.open(file + '.gz', 'rt') as json_file:
+                self.assertEqual(json_file.read(), repr(ga1))
+            ga2 = GraphAlgo()
+            self.assertTrue(ga2.load_from_json(file + '.gz'))
+            self.assertEqual(repr(ga2), repr(ga1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import numpy as np
+from matplotlib.collections import EllipseCollection, LineCollection
+
+"""Drawing of big graphs with matplotlib: all the nodes are one EllipseCollection and all the edges
+   one quiver of arrows, or one LineCollection when there are too many edges for arrow heads to be seen,
+   instead of an artist for every node, label and edge. the level of detail follows the size of the plot:
+   edges hidden under their two nodes are culled, above max_edges a seeded sample of the rest is drawn,
+   and the labels are thinned to one per cell of a grid, so they don't cover each other"""
+
+"""The most edges drawn, the others are sampled out"""
+
+MAX_EDGES = 200000
+
+"""The most edges drawn with arrow heads, more are drawn as plain lines"""
+
+MAX_ARROWS = 2000
+
+"""The width and height of a label's grid cell in inches, at most one label is drawn in every cell"""
+
+LABEL_CELL = (0.4, 0.2)
+
+
+"""Return the arrays that draw uses, from a CSR snapshot of the graph
+   @param graph: any GraphInterface
+   @param fallback: a dictionary of the x, y to draw the nodes without a position at, or None
+   @return the node ids (a list), their x, y (a NumPy array [n, 2]) and the rows of every edge's src and dest"""
+
+
+def graph_arrays(graph, fallback: dict = None):
+    snapshot = graph.freeze()
+    n = len(snapshot.ids)
+    if snapshot.positions is None:
+        xy = np.zeros((n, 2))
+    else:
+        xy = np.frombuffer(snapshot.positions, dtype=np.float64).reshape(n, 3)[:, :2]
+    if fallback:
+        xy = xy.copy()
+        rows = dict(zip(snapshot.ids, range(n)))
+        for key, pos in fallback.items():
+            xy[rows[key]] = pos
+    offsets = np.frombuffer(snapshot.offsets, dtype=np.int32)
+    src = np.repeat(np.arange(n), np.diff(offsets))
+    dest = np.frombuffer(snapshot.targets, dtype=np.int32)
+    return list(snapshot.ids), xy, src, dest
+
+
+"""Draw a graph on a matplotlib Axes whose limits are already set.
+   the sizes are worked out in pixels of the Axes, so the nodes stay round and shrink when they are so many
+   that they would cover the plot, and an edge is culled when its two nodes hide it
+   @param ids: the node ids, see graph_arrays
+   @param xy: the nodes' positions
+   @param src: the row of every edge's src
+   @param dest: the row of every edge's dest
+   @param r: the largest radius of the nodes in data units
+   @param labels: draw the nodes' ids
+   @param max_edges: the most edges drawn
+   @param seed: the seed of the edge sample
+   @return a dictionary of the number of nodes, labels and edges drawn and of edges culled and sampled out"""
+
+
+def draw(ax, ids, xy, src, dest, r: float, labels: bool = True, max_edges: int = MAX_EDGES, seed: int = 5) -> dict:
+    width = max(ax.bbox.width, 1)
+    height = max(ax.bbox.height, 1)
+    x_min, x_max = ax.get_xlim()
+    y_min, y_max = ax.get_ylim()
+    pixel = np.array([(x_max - x_min) / width, (y_max - y_min) / height])
+    r_px = r / pixel.max()
+    if len(ids) > 0:
+        r_px = min(r_px, 0.3 * np.sqrt(width * height / len(ids)))
+    r_px = max(r_px, 1.0)
+
+    delta = xy[dest] - xy[src]
+    length_px = np.hypot(delta[:, 0] / pixel[0], delta[:, 1] / pixel[1])
+    shown = np.flatnonzero(length_px > 2 * r_px)
+    culled = len(src) - len(shown)
+    sampled_out = 0
+    if len(shown) > max_edges:
+        sampled_out = len(shown) - max_edges
+        shown = np.sort(np.random.default_rng(seed).choice(shown, max_edges, replace=False))
+
+    start = xy[src[shown]]
+    delta = delta[shown]
+    label_box = None
+    if len(shown) <= MAX_ARROWS:
+        delta = delta * (1 - r_px / length_px[shown])[:, None]
+        ax.quiver(start[:, 0], start[:, 1], delta[:, 0], delta[:, 1], angles='xy', scale_units='xy', scale=1,
+                  width=0.002, headwidth=5, headlength=6, color='black', zorder=1)
+    else:
+        alpha = min(1.0, max(0.02, MAX_ARROWS / len(shown)))
+        label_box = dict(facecolor='white', alpha=0.7, edgecolor='none', pad=1)
+        ax.add_collection(LineCollection(np.stack((start, start + delta), axis=1), linewidths=0.5,
+                                         colors='black', alpha=alpha, zorder=1))
+
+    dpi_scale = ax.figure.dpi / 72
+    ax.add_collection(EllipseCollection(2 * r_px / dpi_scale, 2 * r_px / dpi_scale, 0, units='points',
+                                        offsets=xy, offset_transform=ax.transData, zorder=2))
+
+    labeled = list()
+    if labels and len(ids) > 0:
+        cell = np.array(LABEL_CELL) * ax.figure.dpi * pixel
+        cells = np.floor((xy - xy.min(axis=0)) / cell).astype(np.int64)
+        keys = cells[:, 0] * (cells[:, 1].max() + 1) + cells[:, 1]
+        labeled = np.sort(np.unique(keys, return_index=True)[1]).tolist()
+        for i in labeled:
+            ax.text(xy[i, 0], xy[i, 1], ids[i], bbox=label_box, zorder=3)
+
+    return {"nodes": len(ids), "labels": len(labeled), "edges": len(shown), "culled": culled,
+            "sampled_out": sampled_out}
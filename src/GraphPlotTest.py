@@ -0,0 +1,89 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from matplotlib.figure import Figure
+from DiGraph import DiGraph
+from GraphAlgo import GraphAlgo
+import GraphPlot
+
+
+class MyTestCase(unittest.TestCase):
+
+    def axes(self, size):
+        ax = Figure(figsize=(6, 6), dpi=100).subplots()
+        ax.axis([0, size, 0, size])
+        return ax
+
+    def test_export(self):
+        ga = GraphAlgo()
+        ga.load_from_json('../data/A5')
+        with tempfile.TemporaryDirectory() as tmp:
+            png = os.path.join(tmp, "a5.png")
+            svg = os.path.join(tmp, "a5.svg")
+            drawn = ga.plot_graph(png)
+            self.assertEqual(drawn["nodes"], 48)
+            self.assertEqual(drawn["edges"], 166)
+            ga.plot_graph(svg, labels=False)
+            with open(png, "rb") as file:
+                self.assertEqual(file.read(8), b"\x89PNG\r\n\x1a\n")
+            with open(svg) as file:
+                self.assertIn("<svg", file.read())
+
+    def test_binary(self):
+        ga = GraphAlgo()
+        ga.load_from_json('../data/T0.json')
+        with tempfile.TemporaryDirectory() as tmp:
+            file = os.path.join(tmp, "t0.bin")
+            png = os.path.join(tmp, "t0.png")
+            self.assertTrue(ga.save_binary(file))
+            for use_mmap in [True, False]:
+                self.assertTrue(ga.load_binary(file, use_mmap))
+                g = ga.get_graph()
+                mc = g.get_mc()
+                drawn = ga.plot_graph(png)
+                self.assertEqual(drawn["nodes"], 4)
+                self.assertEqual(drawn["edges"] + drawn["culled"], g.e_size())
+                self.assertEqual(g.get_mc(), mc)
+                self.assertTrue(all(g.get_node_pos(n) is None for n in g.get_all_v()))
+                with open(png, "rb") as file_png:
+                    self.assertEqual(file_png.read(8), b"\x89PNG\r\n\x1a\n")
+
+    def test_arrays(self):
+        g = DiGraph()
+        for i in range(4):
+            g.add_node(i * 10, (i, 2 * i, 0))
+        g.add_edge(0, 10, 1)
+        g.add_edge(30, 0, 1)
+        ids, xy, src, dest = GraphPlot.graph_arrays(g)
+        self.assertEqual(ids, [0, 10, 20, 30])
+        self.assertEqual(xy.tolist(), [[0, 0], [1, 2], [2, 4], [3, 6]])
+        self.assertEqual(sorted(zip(src.tolist(), dest.tolist())), [(0, 1), (3, 0)])
+
+    def test_culling(self):
+        xy = np.array([[0, 0], [0.1, 0], [50, 50], [100, 100]], dtype=float)
+        src = np.array([0, 1, 2])
+        dest = np.array([1, 2, 3])
+        drawn = GraphPlot.draw(self.axes(100), [0, 1, 2, 3], xy, src, dest, 1.0)
+        self.assertEqual(drawn["culled"], 1)
+        self.assertEqual(drawn["edges"], 2)
+        self.assertEqual(drawn["labels"], 3)
+
+    def test_sampling_and_labels(self):
+        rng = np.random.default_rng(1)
+        n = 5000
+        xy = rng.random((n, 2)) * 100
+        src = rng.integers(0, n, 20000)
+        dest = rng.integers(0, n, 20000)
+        ax = self.axes(100)
+        drawn = GraphPlot.draw(ax, list(range(n)), xy, src, dest, 1.0, max_edges=5000)
+        self.assertEqual(drawn["edges"], 5000)
+        self.assertEqual(drawn["edges"] + drawn["culled"] + drawn["sampled_out"], 20000)
+        cells = (6 * 0.775 / GraphPlot.LABEL_CELL[0] + 1) * (6 * 0.77 / GraphPlot.LABEL_CELL[1] + 1)
+        self.assertLessEqual(drawn["labels"], cells)
+        self.assertEqual(len(ax.texts), drawn["labels"])
+        self.assertLess(len(ax.get_children()), 2 * cells)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import json
+import time
+import tracemalloc
+
+"""Opt in counters for GraphAlgo calls, nothing here runs until it is turned on.
+   GraphAlgo.instrument shadows its query methods on the instance with the wrappers made here and
+   removing the shadows leaves the plain class methods. while a wrapped call runs, the GraphAlgo's _stats
+   is its CallStats and the searches add their counters to it, when it is None they only keep a few
+   local counts, so when it is off it costs next to nothing"""
+
+"""The GraphAlgo methods that instrument times and counts"""
+
+INSTRUMENTED = ("shortest_path", "shortest_paths_from", "connected_component", "connected_components")
+
+
+class CallStats:
+    """The counters of one call
+       @param name: the called method"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.seconds = 0.0
+        self.setup_seconds = 0.0
+        self.path_seconds = 0.0
+        self.settled = 0
+        self.relaxed = 0
+        self.heap_pushes = 0
+        self.heap_pops = 0
+        self.allocated = None
+
+    """Return the counters as a dictionary:
+       seconds - the whole call
+       setup_seconds - getting the search state ready: the cache lookup (and its reset when the graph changed),
+                       or remaking a stale landmark, contraction hierarchies or A* bound
+       path_seconds - building the path list of the result
+       settled - the nodes whose edges were read, relaxed - the edges read, by the search itself
+       heap_pushes, heap_pops - the priority queue operations of the searches
+       allocated - the peak bytes allocated during the call, None if allocations aren't traced"""
+
+    def as_dict(self) -> dict:
+        return dict(vars(self))
+
+    def __repr__(self):
+        return json.dumps(self.as_dict())
+
+
+"""Wrap an edge getter of a graph so every call adds to the counters of a CallStats,
+   the wrapper is local to the running call, the graph itself isn't changed
+   @param get_edges: e.g. graph.all_out_edges_of_node
+   @return the counting function"""
+
+
+def counted(get_edges, stats: CallStats):
+    def count(id1):
+        edges = get_edges(id1)
+        if edges is not None:
+            stats.settled += 1
+            stats.relaxed += len(edges)
+        return edges
+    return count
+
+
+"""Wrap a GraphAlgo method so every call fills a CallStats
+   @param algo: the GraphAlgo, its _stats is the CallStats of the running call
+   @param name: the method's name, kept in the CallStats
+   @param callback: a function of the CallStats, called after every call, or None
+   @param allocations: trace the allocations with tracemalloc (much slower)
+   @return the wrapped method"""
+
+
+def instrumented(algo, name: str, method, callback=None, allocations: bool = False):
+    def call(*args, **kwargs):
+        stats = CallStats(name)
+        started_tracing = allocations and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        if allocations:
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+        outer = algo._stats
+        algo._stats = stats
+        start = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            stats.seconds = time.perf_counter() - start
+            algo._stats = outer
+            if allocations:
+                stats.allocated = tracemalloc.get_traced_memory()[1] - before
+            if started_tracing:
+                tracemalloc.stop()
+            algo.last_stats = stats
+            if callback is not None:
+                callback(stats)
+    return call
@@ -0,0 +1,109 @@
+import unittest
+from DiGraph import DiGraph
+from GraphAlgo import GraphAlgo
+
+
+class MyTestCase(unittest.TestCase):
+
+    def test_counters(self):
+        ga = GraphAlgo(cache_size=0)
+        ga.load_from_json('../data/A5')
+        expected = ga.shortest_path(0, 40)
+        calls = list()
+        ga.instrument(callback=calls.append)
+        for method in GraphAlgo.PATH_METHODS:
+            self.assertEqual(ga.shortest_path(0, 40, method), expected)
+            stats = ga.last_stats
+            self.assertEqual(stats.name, "shortest_path")
+            self.assertGreater(stats.settled, 0)
+            self.assertGreaterEqual(stats.relaxed, stats.settled)
+            self.assertGreater(stats.heap_pushes, 0)
+            self.assertGreater(stats.heap_pops, 0)
+            self.assertGreaterEqual(stats.seconds, stats.setup_seconds + stats.path_seconds)
+            self.assertIsNone(stats.allocated)
+        self.assertEqual(len(calls), len(GraphAlgo.PATH_METHODS))
+
+        ga.connected_components()
+        self.assertEqual(ga.last_stats.name, "connected_components")
+        self.assertEqual(ga.last_stats.settled, ga.get_graph().v_size())
+        self.assertEqual(ga.last_stats.heap_pushes, 0)
+
+    def test_cached_tree(self):
+        ga = GraphAlgo()
+        ga.load_from_json('../data/A5')
+        ga.instrument()
+        ga.shortest_paths_from(0)
+        first = ga.last_stats
+        self.assertEqual(first.settled, ga.get_graph().v_size())
+        ga.shortest_path(0, 40)
+        self.assertEqual(ga.last_stats.settled, 0)
+        self.assertEqual(ga.last_stats.heap_pops, 0)
+        self.assertGreater(ga.last_stats.path_seconds, 0)
+
+    def test_allocations(self):
+        ga = GraphAlgo()
+        ga.load_from_json('../data/A5')
+        ga.instrument(allocations=True)
+        ga.connected_component(0)
+        self.assertGreater(ga.last_stats.allocated, 0)
+        self.assertIn("allocated", ga.last_stats.as_dict())
+
+    def test_off(self):
+        g = DiGraph()
+        for i in range(3):
+            g.add_node(i)
+        g.add_edge(0, 1, 1)
+        g.add_edge(1, 2, 1)
+        ga = GraphAlgo(g)
+        ga.instrument()
+        ga.shortest_path(0, 1)
+        self.assertNotIn("all_out_edges_of_node", vars(g))
+        ga.instrument(False)
+        self.assertNotIn("shortest_path", vars(ga))
+        ga.last_stats = None
+        self.assertEqual(ga.shortest_path(0, 2), (2, [0, 1, 2]))
+        self.assertIsNone(ga.last_stats)
+
+    def test_shared_graph(self):
+        ga = GraphAlgo(cache_size=0)
+        ga.load_from_json('../data/A5')
+        other = GraphAlgo(ga.get_graph(), cache_size=0)
+        plain = GraphAlgo(ga.get_graph(), cache_size=0)
+        ga.instrument()
+        other.instrument()
+        ga.connected_components()
+        self.assertEqual(ga.last_stats.settled, 48)
+        plain.connected_components()
+        plain.shortest_path(0, 40)
+        other.shortest_path(0, 40, "bidirectional")
+        ga.connected_components()
+        self.assertEqual(ga.last_stats.settled, 48)
+        self.assertEqual(ga.last_stats.relaxed, 166)
+        ga.instrument(False)
+        other.instrument(False)
+        self.assertEqual(other.shortest_path(0, 40), ga.shortest_path(0, 40))
+
+    def test_ch_counts(self):
+        ga = GraphAlgo(cache_size=0)
+        ga.load_from_json('../data/A5')
+        ga.preprocess_ch()
+        ga.instrument()
+        ga.shortest_path(0, 40, "ch")
+        stats = ga.last_stats
+        dist_f, prev_f = ga._ch._upward(0, ga._ch.up)
+        dist_b, prev_b = ga._ch._upward(40, ga._ch.down)
+        self.assertEqual(stats.settled, len(dist_f) + len(dist_b))
+        self.assertLessEqual(stats.settled, stats.heap_pops)
+
+    def test_replaced_graph(self):
+        ga = GraphAlgo()
+        ga.load_from_json('../data/A0')
+        ga.instrument()
+        ga.connected_components()
+        ga.load_from_json('../data/A1')
+        ga.connected_components()
+        self.assertEqual(ga.last_stats.settled, ga.get_graph().v_size())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import time
+from array import array
+from ShortestPathTree import ShortestPathTree
+
+"""Landmark distance tables for A* with landmarks and the triangle inequality (ALT).
+   for every landmark L the distances d(L, v) and d(v, L) to all the nodes are kept in float arrays,
+   then for any node v and target t both d(L, t) - d(L, v) and d(v, L) - d(t, L) are lower bounds of d(v, t)"""
+
+
+class Landmarks:
+    """Choose k landmarks and calculate their distance tables, the first landmark is the graph's first node
+       and each next one is the node farthest from the ones already chosen
+       @param graph: the graph, the tables are only valid while its mc doesn't change
+       @param k: the number of landmarks"""
+
+    def __init__(self, graph, k: int = 8):
+        start = time.perf_counter()
+        self.graph = graph
+        self.mc = graph.get_mc()
+        self.index = {n: i for i, n in enumerate(graph.get_all_v())}
+        self.landmarks = list()
+        self.forward = list()
+        self.backward = list()
+        n = len(self.index)
+        inf = float('inf')
+        closest = array('d', [inf]) * n
+
+        key = next(iter(self.index), None)
+        while key is not None and len(self.landmarks) < min(k, n):
+            self.landmarks.append(key)
+            self.forward.append(self._table(ShortestPathTree(graph, key)))
+            self.backward.append(self._table(ShortestPathTree(graph, key, reverse=True)))
+
+            fwd = self.forward[-1]
+            bwd = self.backward[-1]
+            for i in range(n):
+                d = min(fwd[i], bwd[i])
+                if d < closest[i]:
+                    closest[i] = d
+            far = max(range(n), key=closest.__getitem__)
+            key = None if closest[far] == 0 else list(self.index)[far]
+
+        self.seconds = time.perf_counter() - start
+
+    """Run a search to the end and put its distances in an array in the order of the nodes"""
+
+    def _table(self, tree: ShortestPathTree) -> array:
+        tree.search()
+        table = array('d', [float('inf')]) * len(self.index)
+        index = self.index
+        for key, d in tree.dist.items():
+            table[index[key]] = d
+        return table
+
+    """Return if the tables were made for the current version of the graph"""
+
+    def is_valid(self, graph) -> bool:
+        return graph is self.graph and graph.get_mc() == self.mc
+
+    """Make the lower bound function for one target
+       @param dest: the target node id
+       @return a function node id -> lower bound of the distance from the node to dest,
+               float('inf') if the tables prove the node can't reach dest"""
+
+    def heuristic(self, dest: int):
+        inf = float('inf')
+        index = self.index
+        t = index[dest]
+        tables = [(fwd, bwd, fwd[t], bwd[t]) for fwd, bwd in zip(self.forward, self.backward)]
+
+        def bound(key):
+            i = index[key]
+            best = 0.0
+            for fwd, bwd, l_to_t, t_to_l in tables:
+                l_to_v = fwd[i]
+                if l_to_v != inf and l_to_t - l_to_v > best:
+                    best = l_to_t - l_to_v
+                if t_to_l != inf and bwd[i] - t_to_l > best:
+                    best = bwd[i] - t_to_l
+            return best * (1 - 1e-9)
+
+        return bound
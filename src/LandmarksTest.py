@@ -0,0 +1,50 @@
+import unittest
+from DiGraph import DiGraph
+from GraphAlgo import GraphAlgo
+from Landmarks import Landmarks
+from ShortestPathTree import ShortestPathTree
+
+
+class MyTestCase(unittest.TestCase):
+
+    def test_bounds(self):
+        ga = GraphAlgo()
+        ga.load_from_json('../data/G_100_800_1.json')
+        g = ga.get_graph()
+        landmarks = Landmarks(g, 4)
+        self.assertEqual(len(landmarks.landmarks), 4)
+        self.assertEqual(len(set(landmarks.landmarks)), 4)
+        for dest in range(0, 100, 9):
+            bound = landmarks.heuristic(dest)
+            for src in range(100):
+                self.assertLessEqual(bound(src), ShortestPathTree(g, src).distance(dest))
+            self.assertEqual(bound(dest), 0)
+
+    def test_unreachable(self):
+        g = DiGraph()
+        for i in range(4):
+            g.add_node(i)
+        g.add_edge(0, 1, 1)
+        g.add_edge(1, 0, 1)
+        g.add_edge(2, 3, 1)
+        landmarks = Landmarks(g, 2)
+        self.assertEqual(landmarks.landmarks, [0, 2])
+        self.assertEqual(landmarks.heuristic(3)(0), float('inf'))
+        self.assertEqual(landmarks.heuristic(1)(0), 1 - 1e-9)
+
+    def test_invalidate(self):
+        g = DiGraph()
+        for i in range(4):
+            g.add_node(i)
+        for i in range(3):
+            g.add_edge(i, i + 1, 1)
+        ga = GraphAlgo(g)
+        ga.preprocess_landmarks(2)
+        self.assertEqual(ga.shortest_path(0, 3, method="alt"), (3, [0, 1, 2, 3]))
+        g.add_edge(0, 3, 1.5)
+        self.assertEqual(ga.shortest_path(0, 3, method="alt"), (1.5, [0, 3]))
+        self.assertTrue(ga._landmarks.is_valid(g))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -58,6 +58,20 @@ class MyTestCase(unittest.TestCase):
         for i in range(len(p)):
             self.assertEqual(p[i], np[i])
 
+    def test_lazy(self):
+        node = DiGraph.Node(0)
+        self.assertFalse(hasattr(node, "__dict__"))
+        self.assertIsNone(node.edges)
+        self.assertIsNone(node.revers_edges)
+        self.assertEqual(node.get_edges(), {})
+        self.assertEqual(node.get_revers_edges(), {})
+        self.assertFalse(node.remove_edge(1))
+        self.assertTrue(node.add_edge(1, 5))
+        self.assertFalse(node.add_edge(1, 6))
+        self.assertEqual(node.get_edges(), {1: 5})
+        node.append_path(3)
+        self.assertEqual(node.get_path(), [3])
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
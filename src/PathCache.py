@@ -0,0 +1,68 @@
+import threading
+from collections import OrderedDict
+from ShortestPathTree import ShortestPathTree
+
+"""A least recently used cache of shortest path trees, one per source node,
+   the trees are only valid for one version of one graph, when the graph or its mc changes the cache is emptied"""
+
+
+class PathCache:
+    """Create an empty cache
+       @param size: the maximal number of trees kept, 0 disables the cache"""
+
+    def __init__(self, size: int = 8):
+        self.size = size
+        self.trees = OrderedDict()
+        self.graph = None
+        self.mc = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.lock = threading.Lock()
+
+    """Return the tree of the source in the graph, a cached one if the graph didn't change since it was made
+       @return a ShortestPathTree from src"""
+
+    def get(self, graph, src: int) -> ShortestPathTree:
+        if self.size <= 0:
+            self.misses += 1
+            return ShortestPathTree(graph, src)
+
+        with self.lock:
+            mc = graph.get_mc()
+            if graph is not self.graph or mc != self.mc:
+                if len(self.trees) > 0:
+                    self.invalidations += 1
+                self.trees.clear()
+                self.graph = graph
+                self.mc = mc
+
+            tree = self.trees.get(src)
+            if tree is not None:
+                self.hits += 1
+                self.trees.move_to_end(src)
+                return tree
+
+            self.misses += 1
+            tree = ShortestPathTree(graph, src)
+            self.trees[src] = tree
+            if len(self.trees) > self.size:
+                self.trees.popitem(last=False)
+                self.evictions += 1
+            return tree
+
+    """Drop all the cached trees"""
+
+    def clear(self):
+        with self.lock:
+            self.trees.clear()
+            self.graph = None
+            self.mc = None
+
+    """Return the cache's counters
+       @return a dictionary {hits, misses, evictions, invalidations, size}"""
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                "invalidations": self.invalidations, "size": len(self.trees)}
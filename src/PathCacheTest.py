@@ -0,0 +1,83 @@
+import unittest
+from DiGraph import DiGraph
+from GraphAlgo import GraphAlgo
+from PathCache import PathCache
+from ShortestPathTree import ShortestPathTree
+
+
+class MyTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.g = DiGraph()
+        for i in range(6):
+            self.g.add_node(i)
+        for i in range(5):
+            self.g.add_edge(i, i + 1, 1)
+        self.g.add_edge(0, 4, 10)
+
+    def test_tree(self):
+        tree = ShortestPathTree(self.g, 0)
+        self.assertEqual(tree.distance(2), 2)
+        self.assertFalse(tree.is_complete())
+        self.assertNotIn(5, tree.settled)
+        self.assertEqual(tree.path(5), [0, 1, 2, 3, 4, 5])
+        self.assertEqual(tree.distance(5), 5)
+        self.assertEqual(tree.path(2), [0, 1, 2])
+
+        tree = ShortestPathTree(self.g, 3)
+        self.assertEqual(tree.distance(0), float('inf'))
+        self.assertEqual(tree.path(0), [])
+        self.assertTrue(tree.is_complete())
+
+    def test_cache(self):
+        ga = GraphAlgo(self.g, cache_size=2)
+        self.assertEqual(ga.shortest_path(0, 3), (3, [0, 1, 2, 3]))
+        self.assertEqual(ga.shortest_path(0, 5), (5, [0, 1, 2, 3, 4, 5]))
+        self.assertEqual(ga.get_cache_stats(), {"hits": 1, "misses": 1, "evictions": 0, "invalidations": 0, "size": 1})
+
+        ga.shortest_path(1, 5)
+        ga.shortest_path(2, 5)
+        ga.shortest_path(0, 5)
+        stats = ga.get_cache_stats()
+        self.assertEqual(stats["evictions"], 2)
+        self.assertEqual(stats["misses"], 4)
+        self.assertEqual(stats["size"], 2)
+
+        self.g.add_edge(0, 5, 1.5)
+        self.assertEqual(ga.shortest_path(0, 5), (1.5, [0, 5]))
+        self.assertEqual(ga.get_cache_stats()["invalidations"], 1)
+        self.g.remove_edge(0, 5)
+        self.assertEqual(ga.shortest_path(0, 5), (5, [0, 1, 2, 3, 4, 5]))
+
+        ga.load_from_json('../data/T0.json')
+        self.assertEqual(ga.shortest_path(0, 3)[1], [0, 1, 3])
+
+    def test_shortest_paths_from(self):
+        ga = GraphAlgo(self.g)
+        dist, tree = ga.shortest_paths_from(0)
+        self.assertEqual(dist, {0: 0, 1: 1, 2: 2, 3: 3, 4: 4, 5: 5})
+        self.assertEqual(tree.path(4), [0, 1, 2, 3, 4])
+
+        dist, tree = ga.shortest_paths_from(2, [5, 0, 2, 7])
+        self.assertEqual(dist, {5: 3, 0: float('inf'), 2: 0, 7: float('inf')})
+        self.assertEqual(tree.path(5), [2, 3, 4, 5])
+        self.assertEqual(tree.path(0), [])
+        self.assertEqual(ga.shortest_paths_from(9), ({}, None))
+
+        ga = GraphAlgo()
+        ga.load_from_json('../data/G_1000_8000_0.json')
+        dist, tree = ga.shortest_paths_from(7)
+        single = GraphAlgo(ga.get_graph(), cache_size=0)
+        for n in range(0, 1000, 37):
+            self.assertEqual((dist.get(n, float('inf')), tree.path(n)), single.shortest_path(7, n))
+
+    def test_disabled(self):
+        cache = PathCache(0)
+        tree = cache.get(self.g, 0)
+        self.assertIsNot(cache.get(self.g, 0), tree)
+        self.assertEqual(cache.stats()["misses"], 2)
+        self.assertEqual(cache.stats()["size"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
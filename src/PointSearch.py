@@ -0,0 +1,169 @@
+import heapq
+import math
+
+"""Point to point shortest path searches, each one returns the distance, the path
+   and the number of nodes it settled, so the methods can be compared on the same graph"""
+
+
+"""Search from both ends at once, forward from src over the out edges and backward from dest over the in edges.
+   the best path seen so far through a node reached by both searches is kept, and the search stops once
+   the smallest forward and backward distances left in the heaps add up to at least its length
+   @param stats: a CallStats that gets the settled nodes, the edges read and the heap operations added, or None
+   @return the distance (float('inf') if there is no path), a list of the nodes' ids and the settled count"""
+
+
+def bidirectional(graph, src: int, dest: int, stats=None) -> (float, list, int):
+    searches = [(graph.all_out_edges_of_node, {src: 0}, {src: None}, set(), [(0, src)]),
+                (graph.all_in_edges_of_node, {dest: 0}, {dest: None}, set(), [(0, dest)])]
+    best = float('inf')
+    meet = None
+    que_f = searches[0][4]
+    que_b = searches[1][4]
+    pushes = 0
+    pops = 0
+    relaxed = 0
+
+    while len(que_f) > 0 and len(que_b) > 0:
+        if que_f[0][0] + que_b[0][0] >= best:
+            break
+        side = 0 if que_f[0][0] <= que_b[0][0] else 1
+        get_edges, dist, prev, settled, que = searches[side]
+        other_dist = searches[1 - side][1]
+
+        d, key = heapq.heappop(que)
+        pops += 1
+        if key in settled:
+            continue
+        settled.add(key)
+
+        edges = get_edges(key)
+        relaxed += len(edges)
+        for edge in edges:
+            ni_dist = d + edges[edge]
+            if ni_dist < dist.get(edge, float('inf')):
+                dist[edge] = ni_dist
+                prev[edge] = key
+                heapq.heappush(que, (ni_dist, edge))
+                pushes += 1
+            if edge in other_dist and ni_dist + other_dist[edge] < best:
+                best = ni_dist + other_dist[edge]
+                meet = edge
+
+    settled_count = len(searches[0][3]) + len(searches[1][3])
+    if stats is not None:
+        stats.settled += settled_count
+        stats.relaxed += relaxed
+        stats.heap_pushes += pushes
+        stats.heap_pops += pops
+    if meet is None:
+        return float('inf'), list(), settled_count
+    path = _join_path(searches[0][2], searches[1][2], meet)
+    return path_length(graph, path), path, settled_count
+
+
+"""Search from src to dest guided by a lower bound of the distance left to dest (A*),
+   the heuristic must be consistent, then every node is settled once with its final distance.
+   nodes whose bound is float('inf') can't reach dest and are never queued
+   @param heuristic: a function node id -> lower bound of the distance from the node to dest
+   @param stats: a CallStats that gets the settled nodes, the edges read and the heap operations added, or None
+   @return the distance (float('inf') if there is no path), a list of the nodes' ids and the settled count"""
+
+
+def astar(graph, src: int, dest: int, heuristic, stats=None) -> (float, list, int):
+    out_edges = graph.all_out_edges_of_node
+    dist = {src: 0}
+    prev = {src: None}
+    bound = {src: heuristic(src)}
+    settled = set()
+    que = [(bound[src], src)]
+    pushes = 0
+    pops = 0
+    relaxed = 0
+
+    while len(que) > 0:
+        f, key = heapq.heappop(que)
+        pops += 1
+        if key in settled:
+            continue
+        settled.add(key)
+        if key == dest:
+            break
+
+        d = dist[key]
+        edges = out_edges(key)
+        relaxed += len(edges)
+        for edge in edges:
+            ni_dist = d + edges[edge]
+            if ni_dist < dist.get(edge, float('inf')):
+                h = bound.get(edge)
+                if h is None:
+                    h = bound[edge] = heuristic(edge)
+                if h == float('inf'):
+                    continue
+                dist[edge] = ni_dist
+                prev[edge] = key
+                heapq.heappush(que, (ni_dist + h, edge))
+                pushes += 1
+
+    if stats is not None:
+        stats.settled += len(settled)
+        stats.relaxed += relaxed
+        stats.heap_pushes += pushes
+        stats.heap_pops += pops
+    if dest not in settled:
+        return float('inf'), list(), len(settled)
+    return dist[dest], _join_path(prev, {dest: None}, dest), len(settled)
+
+
+"""Find the smallest ratio between an edge's weight and the straight line distance between its nodes,
+   multiplied by the straight line distance to the target it is a consistent A* bound.
+   the ratio is lowered by a tiny factor so rounding can't make the bound larger than the real distance
+   @return the ratio, or None if some node has no position"""
+
+
+def min_weight_ratio(graph):
+    ratio = float('inf')
+    for n in graph.get_all_v():
+        pos = graph.get_node_pos(n)
+        if pos is None:
+            return None
+        edges = graph.all_out_edges_of_node(n)
+        for e in edges:
+            e_pos = graph.get_node_pos(e)
+            if e_pos is None:
+                return None
+            length = math.dist(pos, e_pos)
+            if length > 0 and edges[e] / length < ratio:
+                ratio = edges[e] / length
+    if ratio == float('inf'):
+        return 0.0
+    return ratio * (1 - 1e-9)
+
+
+"""Sum the weights along a path from its start, in the same order a forward search adds them
+   @return the length of the path"""
+
+
+def path_length(graph, path: list) -> float:
+    dist = 0
+    for i in range(len(path) - 1):
+        dist += graph.all_out_edges_of_node(path[i])[path[i + 1]]
+    return dist
+
+
+"""Build a path from the forward and backward predecessors of a meeting node
+   @return a list of the nodes' ids from the forward source to the backward source"""
+
+
+def _join_path(prev_f: dict, prev_b: dict, meet: int) -> list:
+    path = list()
+    key = meet
+    while key is not None:
+        path.append(key)
+        key = prev_f[key]
+    path.reverse()
+    key = prev_b[meet]
+    while key is not None:
+        path.append(key)
+        key = prev_b[key]
+    return path
@@ -0,0 +1,106 @@
+import threading
+from array import array
+
+"""The positions of a loaded graph's nodes, kept as the "x,y,z" text of the file until a position is
+   first asked for, then all of them are decoded at once into one flat array of floats, three per node,
+   instead of a tuple per node. graphs that are only searched never pay for the parsing.
+   the decoding is locked, so threads that query the graph together decode it once.
+   like in CSRGraph, while the nodes come as 0, 1, 2... the id is the row and no index is kept"""
+
+"""How many position strings are joined into one piece of text while they wait to be decoded"""
+
+CHUNK_SIZE = 4096
+
+
+class PositionTable:
+    """Create an empty table"""
+
+    def __init__(self):
+        self.size = 0
+        self.rows = None
+        self.coords = array('d')
+        self.chunks = list()
+        self.pending = list()
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return self.size if self.rows is None else len(self.rows)
+
+    """Return if every position was decoded already"""
+
+    def is_decoded(self) -> bool:
+        return len(self.chunks) == 0 and len(self.pending) == 0
+
+    """Keep the position string of a node for later, if the node already has one the first is kept
+       @param key: the node id
+       @param str_pos: the "x,y,z" string of the node's position
+       @return if the position was added"""
+
+    def add(self, key: int, str_pos: str) -> bool:
+        if self.rows is None and key != self.size:
+            if 0 <= key < self.size:
+                return False
+            self._index()
+        if self.rows is not None:
+            if key in self.rows:
+                return False
+            self.rows[key] = self.size
+        self.size += 1
+        pending = self.pending
+        pending.append(str_pos)
+        if len(pending) == CHUNK_SIZE:
+            self.chunks.append((len(pending), ";".join(pending)))
+            pending.clear()
+        return True
+
+    """Forget the position of a node"""
+
+    def remove(self, key: int) -> bool:
+        if self.rows is None:
+            if not 0 <= key < self.size:
+                return False
+            self._index()
+        return self.rows.pop(key, None) is not None
+
+    def _index(self):
+        self.rows = {key: key for key in range(self.size)}
+
+    """Return the position of a node, decoding all the kept strings the first time
+       @return a tuple (x, y, z), or None if the table has no position for the node"""
+
+    def get(self, key: int):
+        if self.rows is None:
+            if not 0 <= key < self.size:
+                return None
+            row = key
+        else:
+            row = self.rows.get(key)
+            if row is None:
+                return None
+        if self.pending or self.chunks:
+            self.decode()
+        i = 3 * row
+        coords = self.coords
+        return coords[i], coords[i + 1], coords[i + 2]
+
+    """Decode the kept text into the float array, a chunk of positions at a time.
+       positions with less than three values get zeros, like in CSRGraph.
+       the new array replaces the old one only when it is whole, so a reader never sees half of it"""
+
+    def decode(self):
+        with self.lock:
+            if not self.pending and not self.chunks:
+                return
+            chunks = list(self.chunks)
+            if self.pending:
+                chunks.append((len(self.pending), ";".join(self.pending)))
+            coords = array('d', self.coords)
+            for count, text in chunks:
+                for values in [str_pos.split(",") for str_pos in text.split(";")]:
+                    if len(values) == 3:
+                        coords.extend(map(float, values))
+                    else:
+                        coords.extend((tuple(map(float, values)) + (0.0, 0.0, 0.0))[:3])
+            self.coords = coords
+            self.chunks = list()
+            self.pending = list()
@@ -0,0 +1,105 @@
+import os
+import tempfile
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from GraphAlgo import GraphAlgo
+from PositionTable import PositionTable
+
+
+class MyTestCase(unittest.TestCase):
+
+    def test_dense(self):
+        table = PositionTable()
+        for i in range(10000):
+            self.assertTrue(table.add(i, "%d,%d,0" % (i, 2 * i)))
+        self.assertFalse(table.add(3, "1,1,1"))
+        self.assertIsNone(table.rows)
+        self.assertFalse(table.is_decoded())
+        self.assertEqual(table.get(9999), (9999.0, 19998.0, 0.0))
+        self.assertTrue(table.is_decoded())
+        self.assertIsNone(table.get(10000))
+        self.assertIsNone(table.get(-1))
+        self.assertEqual(len(table), 10000)
+
+    def test_sparse_ids(self):
+        table = PositionTable()
+        table.add(0, "0,0,0")
+        table.add(5, "1.5,2")
+        table.add(2, "3,4,5")
+        self.assertFalse(table.add(5, "9,9,9"))
+        self.assertTrue(table.remove(0))
+        self.assertFalse(table.remove(0))
+        self.assertIsNone(table.get(0))
+        self.assertEqual(table.get(5), (1.5, 2.0, 0.0))
+        self.assertEqual(table.get(2), (3.0, 4.0, 5.0))
+        table.add(7, "7,7,7")
+        self.assertEqual(table.get(7), (7.0, 7.0, 7.0))
+        self.assertEqual(len(table), 3)
+
+    def test_mixed_lengths(self):
+        table = PositionTable()
+        for i, str_pos in enumerate(["1,2", "3,4,5,6", "7,8,9"]):
+            table.add(i, str_pos)
+        self.assertEqual(table.get(0), (1.0, 2.0, 0.0))
+        self.assertEqual(table.get(1), (3.0, 4.0, 5.0))
+        self.assertEqual(table.get(2), (7.0, 8.0, 9.0))
+
+    def test_threads(self):
+        n = 200000
+        for run in range(3):
+            table = PositionTable()
+            for i in range(n):
+                table.add(i, "%d,%d,%d" % (i, -i, run))
+            start = threading.Barrier(8)
+
+            def read(t):
+                start.wait()
+                return [table.get(key) for key in range(t, n, 997)]
+
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                results = list(pool.map(read, range(8)))
+            self.assertEqual(len(table.coords), 3 * n)
+            for t, result in enumerate(results):
+                self.assertEqual(result, [(key, -key, run) for key in range(t, n, 997)])
+            self.assertEqual(table.get(n - 1), (n - 1, 1 - n, run))
+
+    def test_lazy_load(self):
+        for file in ["A0", "A5", "T0.json", "G_100_800_0.json"]:
+            eager = GraphAlgo()
+            eager.load_from_json('../data/' + file, lazy_pos=False)
+            lazy = GraphAlgo()
+            lazy.load_from_json('../data/' + file)
+            g = lazy.get_graph()
+            tables = {id(node.pos): node.pos for node in g.get_all_v().values() if node.pos is not None}
+            self.assertLessEqual(len(tables), 1)
+            for table in tables.values():
+                self.assertIsInstance(table, PositionTable)
+                self.assertFalse(table.is_decoded())
+            for n, node in g.get_all_v().items():
+                self.assertEqual(node.get_pos(), eager.get_graph().get_all_v()[n].get_pos())
+                self.assertEqual(g.get_node_pos(n), eager.get_graph().get_node_pos(n))
+            self.assertEqual(repr(g), repr(eager.get_graph()))
+
+    def test_changes(self):
+        ga = GraphAlgo()
+        ga.load_from_json('../data/A1')
+        g = ga.get_graph()
+        pos = g.get_node_pos(3)
+        g.get_all_v()[3].set_pos((1, 2, 3))
+        self.assertEqual(g.get_node_pos(3), (1, 2, 3))
+        g.remove_node(4)
+        g.add_node(4)
+        self.assertIsNone(g.get_node_pos(4))
+        with tempfile.TemporaryDirectory() as tmp:
+            file = os.path.join(tmp, "out.json")
+            ga.save_to_json(file)
+            ga.load_from_json(file)
+        self.assertEqual(ga.get_graph().get_node_pos(3), (1, 2, 3))
+        self.assertEqual(ga.get_graph().get_node_pos(5), g.get_node_pos(5))
+        self.assertIsNone(ga.get_graph().get_node_pos(4))
+        self.assertNotEqual(pos, (1, 2, 3))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,316 @@
+"""The strongly connected components of a graph, kept up to date while the graph changes.
+   the components form a DAG that is kept in a topological order (Pearce-Kelly): adding an edge only
+   searches the components between its ends in that order, and merges them if the edge closes a cycle.
+   removing an edge inside a component first checks if its source still reaches its target, only if not
+   the component is recomputed. edges between components just update the DAG's edge counts"""
+
+
+"""Find the strongly connected components with an iterative version of Tarjan's algorithm
+   @param roots: the nodes to start searches from
+   @param out_edges: a function node id -> dictionary of the node's out edges
+   @param inside: if given, only edges to these nodes are followed
+   @return a list of lists of the components' nodes, every component comes before the components
+           that can reach it (reverse topological order)"""
+
+
+def strong_components(roots, out_edges, inside=None) -> list:
+    comps = list()
+    index = dict()
+    low = dict()
+    stack = list()
+    on_stack = set()
+    count = 0
+
+    for root in roots:
+        if root in index:
+            continue
+        index[root] = low[root] = count
+        count += 1
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(out_edges(root)))]
+
+        while len(work) != 0:
+            key, edges = work[-1]
+            for edge in edges:
+                if inside is not None and edge not in inside:
+                    continue
+                if edge not in index:
+                    index[edge] = low[edge] = count
+                    count += 1
+                    stack.append(edge)
+                    on_stack.add(edge)
+                    work.append((edge, iter(out_edges(edge))))
+                    break
+                if edge in on_stack and index[edge] < low[key]:
+                    low[key] = index[edge]
+            else:
+                work.pop()
+                if len(work) != 0:
+                    parent = work[-1][0]
+                    if low[key] < low[parent]:
+                        low[parent] = low[key]
+                if low[key] == index[key]:
+                    comp = list()
+                    while True:
+                        n = stack.pop()
+                        on_stack.discard(n)
+                        comp.append(n)
+                        if n == key:
+                            break
+                    comps.append(comp)
+
+    return comps
+
+
+class SCCIndex:
+    """Compute the components of a graph, to follow its changes register the index with graph.add_listener
+       @param graph: any GraphInterface"""
+
+    def __init__(self, graph):
+        self.graph = graph
+        self.mc = graph.get_mc()
+        self.comp_of = dict()
+        self.members = dict()
+        self.order = dict()
+        self.out_count = dict()
+        self.in_count = dict()
+        self.next_id = 0
+        self.next_order = 0
+        self.merges = 0
+        self.splits = 0
+
+        comps = strong_components(graph.get_all_v(), graph.all_out_edges_of_node)
+        for comp in reversed(comps):
+            self._new_component(comp)
+        for c in self.members:
+            self._count_edges(c)
+
+    """Return if the index matches this version of the graph"""
+
+    def is_valid(self, graph) -> bool:
+        return graph is self.graph and graph.get_mc() == self.mc
+
+    """Return the nodes of the component of a node, sorted by id
+       @return a list of the nodes' ids, or an empty list if the node doesn't exist"""
+
+    def component(self, id1: int) -> list:
+        c = self.comp_of.get(id1)
+        if c is None:
+            return list()
+        return sorted(self.members[c])
+
+    """Return all the components, ordered by their first node and each one keeping the graph's node order
+       @return a list of lists of the components' nodes"""
+
+    def components(self) -> list:
+        groups = dict()
+        comp_of = self.comp_of
+        for n in self.graph.get_all_v():
+            groups.setdefault(comp_of[n], []).append(n)
+        return list(groups.values())
+
+    ################################# Graph_Listener ###############################################################
+
+    def node_added(self, node_id: int):
+        self.mc = self.graph.get_mc()
+        self._new_component([node_id])
+
+    def node_removed(self, node_id: int, out_edges: dict, in_edges: dict):
+        self.mc = self.graph.get_mc()
+        c = self.comp_of.pop(node_id)
+        for n in out_edges:
+            if self.comp_of[n] != c:
+                self._uncount(c, self.comp_of[n])
+        for n in in_edges:
+            if self.comp_of[n] != c:
+                self._uncount(self.comp_of[n], c)
+        self.members[c].discard(node_id)
+        if len(self.members[c]) == 0:
+            self._drop_component(c)
+        else:
+            self._split(c)
+
+    def edge_added(self, id1: int, id2: int):
+        self.mc = self.graph.get_mc()
+        c1 = self.comp_of[id1]
+        c2 = self.comp_of[id2]
+        if c1 == c2:
+            return
+        out_c1 = self.out_count[c1]
+        out_c1[c2] = out_c1.get(c2, 0) + 1
+        in_c2 = self.in_count[c2]
+        in_c2[c1] = in_c2.get(c1, 0) + 1
+        if self.order[c1] < self.order[c2]:
+            return
+
+        order = self.order
+        low = order[c2]
+        high = order[c1]
+        forward = self._reach(c2, self.out_count, lambda c: order[c] <= high)
+        backward = self._reach(c1, self.in_count, lambda c: order[c] >= low)
+        places = sorted(order[c] for c in forward | backward)
+        cycle = forward & backward
+        before = sorted(backward - cycle, key=order.get)
+        after = sorted(forward - cycle, key=order.get)
+
+        for c, place in zip(before, places):
+            order[c] = place
+        for c, place in zip(after, places[len(places) - len(after):]):
+            order[c] = place
+        if len(cycle) != 0:
+            merged = self._merge(cycle)
+            order[merged] = places[len(before)]
+
+    def edge_removed(self, id1: int, id2: int):
+        self.mc = self.graph.get_mc()
+        c1 = self.comp_of[id1]
+        c2 = self.comp_of[id2]
+        if c1 != c2:
+            self._uncount(c1, c2)
+        elif not self._still_reaches(id1, id2, self.members[c1]):
+            self._split(c1)
+
+    ################################# Private ######################################################################
+
+    """Add a component after all the others in the order
+       @return the new component's id"""
+
+    def _new_component(self, nodes) -> int:
+        c = self.next_id
+        self.next_id += 1
+        self.members[c] = set(nodes)
+        for n in nodes:
+            self.comp_of[n] = c
+        self.order[c] = self.next_order
+        self.next_order += 1
+        self.out_count[c] = dict()
+        self.in_count[c] = dict()
+        return c
+
+    def _drop_component(self, c):
+        for d in self.out_count.pop(c):
+            del self.in_count[d][c]
+        for d in self.in_count.pop(c):
+            del self.out_count[d][c]
+        del self.members[c]
+        del self.order[c]
+
+    """Count the edges from the component to other components in the DAG,
+       @param old_nodes: the nodes of a component that was just split, the edges into the component from
+                         nodes outside them are counted as well (the ones from inside are counted by their part)"""
+
+    def _count_edges(self, c, old_nodes=None):
+        comp_of = self.comp_of
+        for n in self.members[c]:
+            for e in self.graph.all_out_edges_of_node(n):
+                d = comp_of[e]
+                if d != c:
+                    self.out_count[c][d] = self.out_count[c].get(d, 0) + 1
+                    self.in_count[d][c] = self.in_count[d].get(c, 0) + 1
+            if old_nodes is None:
+                continue
+            for e in self.graph.all_in_edges_of_node(n):
+                if e not in old_nodes:
+                    d = comp_of[e]
+                    self.out_count[d][c] = self.out_count[d].get(c, 0) + 1
+                    self.in_count[c][d] = self.in_count[c].get(d, 0) + 1
+
+    def _uncount(self, c1, c2):
+        out_c1 = self.out_count[c1]
+        out_c1[c2] -= 1
+        if out_c1[c2] == 0:
+            del out_c1[c2]
+            del self.in_count[c2][c1]
+        else:
+            self.in_count[c2][c1] -= 1
+
+    """Search the component DAG from a component over the given edge counts, only entering components
+       that pass the test
+       @return a set of the reached components"""
+
+    @staticmethod
+    def _reach(start, edges_of, allowed) -> set:
+        seen = {start}
+        stack = [start]
+        while len(stack) != 0:
+            c = stack.pop()
+            for d in edges_of[c]:
+                if d not in seen and allowed(d):
+                    seen.add(d)
+                    stack.append(d)
+        return seen
+
+    """Merge components into the largest of them, edges between them become internal
+       @return the id of the merged component"""
+
+    def _merge(self, comps) -> int:
+        target = max(comps, key=lambda c: len(self.members[c]))
+        members = self.members[target]
+        out_t = self.out_count[target]
+        in_t = self.in_count[target]
+        for c in comps:
+            if c == target:
+                continue
+            for n in self.members.pop(c):
+                self.comp_of[n] = target
+                members.add(n)
+            for d, count in self.out_count.pop(c).items():
+                del self.in_count[d][c]
+                if d != target:
+                    out_t[d] = out_t.get(d, 0) + count
+                    self.in_count[d][target] = self.in_count[d].get(target, 0) + count
+            for d, count in self.in_count.pop(c).items():
+                del self.out_count[d][c]
+                if d != target:
+                    in_t[d] = in_t.get(d, 0) + count
+                    self.out_count[d][target] = self.out_count[d].get(target, 0) + count
+            del self.order[c]
+            self.merges += 1
+        return target
+
+    """Check if src still reaches dest inside a component, with a search forward from src and backward
+       from dest that grow one node at a time by turns, so it stops as soon as they meet or one runs out.
+       if an edge's source still reaches its target the edge's removal didn't break the component
+       @return if a path was found"""
+
+    def _still_reaches(self, src, dest, nodes) -> bool:
+        sides = [(self.graph.all_out_edges_of_node, {src}, [src]), (self.graph.all_in_edges_of_node, {dest}, [dest])]
+        side = 0
+        while True:
+            edges_of, seen, stack = sides[side]
+            other = sides[1 - side][1]
+            if len(stack) == 0:
+                return False
+            for e in edges_of(stack.pop()):
+                if e in other:
+                    return True
+                if e not in seen and e in nodes:
+                    seen.add(e)
+                    stack.append(e)
+            side = 1 - side
+
+    """Recompute a component that may have lost its strong connectivity, if it splits the parts take its
+       place in the order and the components after it are shifted to make room"""
+
+    def _split(self, c):
+        nodes = self.members[c]
+        comps = strong_components(nodes, self.graph.all_out_edges_of_node, nodes)
+        if len(comps) == 1:
+            return
+        place = self.order[c]
+        self._drop_component(c)
+        room = len(comps) - 1
+        for d in self.order:
+            if self.order[d] > place:
+                self.order[d] += room
+
+        parts = list()
+        for i, comp in enumerate(reversed(comps)):
+            part = self._new_component(comp)
+            self.order[part] = place + i
+            parts.append(part)
+        self.next_order += room - len(comps)
+        for part in parts:
+            self._count_edges(part, nodes)
+        self.splits += 1
@@ -0,0 +1,74 @@
+import random
+import unittest
+from DiGraph import DiGraph
+from GraphAlgo import GraphAlgo
+from SCCIndex import SCCIndex
+
+
+class MyTestCase(unittest.TestCase):
+
+    def check(self, g, scc):
+        self.assertEqual(scc.components(), GraphAlgo(g).connected_components())
+        for n in g.get_all_v():
+            for e in g.all_out_edges_of_node(n):
+                c1, c2 = scc.comp_of[n], scc.comp_of[e]
+                if c1 != c2:
+                    self.assertLess(scc.order[c1], scc.order[c2])
+                    self.assertGreater(scc.out_count[c1][c2], 0)
+
+    def test_merge_split(self):
+        g = DiGraph()
+        for i in range(6):
+            g.add_node(i)
+        for i in range(5):
+            g.add_edge(i + 1, i, 1)
+        ga = GraphAlgo(g)
+        ga.track_components()
+        self.assertEqual(len(ga.connected_components()), 6)
+        g.add_edge(0, 4, 1)
+        self.assertEqual(ga.connected_component(2), [0, 1, 2, 3, 4])
+        self.assertEqual(ga._scc.merges, 4)
+        g.add_edge(2, 4, 1)
+        g.remove_edge(1, 0)
+        self.assertEqual(ga.connected_component(2), [2, 3, 4])
+        self.assertEqual(ga.connected_component(1), [1])
+        self.assertEqual(ga.connected_component(0), [0])
+        self.check(g, ga._scc)
+        g.remove_node(3)
+        self.assertEqual(ga.connected_component(2), [2])
+        self.assertEqual(ga.connected_component(3), [])
+        g.add_node(7)
+        g.add_edges_from([(7, 5, 1), (5, 7, 1)])
+        self.assertEqual(ga.connected_component(5), [5, 7])
+        self.check(g, ga._scc)
+
+    def test_random_changes(self):
+        r = random.Random(5)
+        g = DiGraph()
+        g.add_nodes_from(range(40))
+        g.add_edges_from((r.randrange(40), r.randrange(40), 1) for i in range(60))
+        scc = SCCIndex(g)
+        g.add_listener(scc)
+        for i in range(300):
+            if r.random() < 0.5:
+                g.add_edge(r.randrange(40), r.randrange(40), 1)
+            else:
+                n = r.randrange(40)
+                edges = list(g.all_out_edges_of_node(n))
+                if len(edges) != 0:
+                    g.remove_edge(n, r.choice(edges))
+            self.assertTrue(scc.is_valid(g))
+            self.check(g, scc)
+
+    def test_replaced_graph(self):
+        ga = GraphAlgo()
+        ga.track_components()
+        ga.load_from_json('../data/A1')
+        self.assertEqual(ga.connected_components(), GraphAlgo(ga.get_graph()).connected_components())
+        self.assertIs(ga._scc.graph, ga.get_graph())
+        ga.track_components(False)
+        self.assertEqual(ga.get_graph().listeners, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
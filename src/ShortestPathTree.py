@@ -0,0 +1,99 @@
+import heapq
+import threading
+
+"""A Dijkstra search from a single source that can be continued later,
+   the search settles nodes only until the asked target is settled and keeps its heap,
+   so a later query for a farther node picks up where the last one stopped"""
+
+
+class ShortestPathTree:
+    """Start a search from src
+       @param graph: the graph to search, read through all_out_edges_of_node
+       @param src: the source node id
+       @param reverse: search over the in edges (all_in_edges_of_node), the distances are then to src"""
+
+    def __init__(self, graph, src: int, reverse: bool = False):
+        self.graph = graph
+        self.src = src
+        self.reverse = reverse
+        self.dist = {src: 0}
+        self.prev = {src: None}
+        self.settled = set()
+        self.que = [(0, src)]
+        self.pushes = 0
+        self.pops = 0
+        self.relaxed = 0
+        self.lock = threading.Lock()
+
+    """Continue the search until the target is settled or every reachable node is,
+       outdated heap entries are skipped when popped instead of being removed,
+       pushes and pops count the heap operations of all the calls and relaxed the edges read
+       @param target: the node to stop at, if None the search runs to the end
+       @return if the target was settled"""
+
+    def search(self, target=None) -> bool:
+        with self.lock:
+            settled = self.settled
+            if target in settled:
+                return True
+            out_edges = self.graph.all_in_edges_of_node if self.reverse else self.graph.all_out_edges_of_node
+            dist = self.dist
+            prev = self.prev
+            que = self.que
+            pushes = 0
+            pops = 0
+            relaxed = 0
+
+            while len(que) > 0:
+                d, key = heapq.heappop(que)
+                pops += 1
+                if key in settled:
+                    continue
+                settled.add(key)
+
+                edges = out_edges(key)
+                relaxed += len(edges)
+                for edge in edges:
+                    ni_dist = d + edges[edge]
+                    if ni_dist < dist.get(edge, float('inf')):
+                        dist[edge] = ni_dist
+                        prev[edge] = key
+                        heapq.heappush(que, (ni_dist, edge))
+                        pushes += 1
+                if key == target:
+                    self.pushes += pushes
+                    self.pops += pops
+                    self.relaxed += relaxed
+                    return True
+
+            self.pushes += pushes
+            self.pops += pops
+            self.relaxed += relaxed
+            return target is None
+
+    """Return if the search settled every node reachable from the source"""
+
+    def is_complete(self) -> bool:
+        return len(self.que) == 0
+
+    """Return the distance from the source to the target, searching further if needed
+       @return the distance, or float('inf') if there is no path"""
+
+    def distance(self, target: int) -> float:
+        if self.search(target):
+            return self.dist[target]
+        return float('inf')
+
+    """Return the path from the source to the target, searching further if needed
+       @return a list of the nodes' ids from the source to the target, or an empty list if there is no path"""
+
+    def path(self, target: int) -> list:
+        if not self.search(target):
+            return list()
+        path = list()
+        key = target
+        while key is not None:
+            path.append(key)
+            key = self.prev[key]
+        path.reverse()
+        return path
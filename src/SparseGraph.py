@@ -0,0 +1,101 @@
+import numpy as np
+
+try:
+    from scipy import sparse
+    from scipy.sparse import csgraph
+except ImportError:
+    sparse = None
+    csgraph = None
+
+"""The NumPy backend of GraphAlgo: the graph as a SciPy sparse matrix, made once from a CSRGraph snapshot,
+   and the algorithms run by SciPy's compiled graph routines instead of Python loops.
+   the rows are the nodes in the graph's order, so the results come out in the same order as the Python ones"""
+
+AVAILABLE = sparse is not None
+
+"""The most distances kept in memory at once by distances, the sources are searched in blocks that fit"""
+
+BLOCK_SIZE = 1 << 22
+
+
+class SparseGraph:
+    """Convert a graph to a sparse matrix
+       @param graph: any GraphInterface"""
+
+    def __init__(self, graph):
+        if not AVAILABLE:
+            raise ImportError("the numpy backend needs scipy")
+        snapshot = graph.freeze()
+        self.graph = graph
+        self.mc = graph.get_mc()
+        self.snapshot = snapshot
+        self.ids = np.frombuffer(snapshot.ids, dtype=np.int64)
+        n = len(self.ids)
+        self.matrix = sparse.csr_matrix((np.frombuffer(snapshot.weights, dtype=np.float64),
+                                         np.frombuffer(snapshot.targets, dtype=np.int32),
+                                         np.frombuffer(snapshot.offsets, dtype=np.int32)), shape=(n, n))
+        self.reverse = None
+
+    """Return if the matrix matches this version of the graph"""
+
+    def is_valid(self, graph) -> bool:
+        return graph is self.graph and graph.get_mc() == self.mc
+
+    """Return all the strongly connected components, ordered by their first node and each one keeping
+       the graph's node order
+       @return a list of lists of the components' nodes"""
+
+    def components(self) -> list:
+        if len(self.ids) == 0:
+            return list()
+        count, labels = csgraph.connected_components(self.matrix, directed=True, connection='strong')
+        labels, first, inverse = np.unique(labels, return_index=True, return_inverse=True)
+        rank = np.empty(len(labels), dtype=np.int64)
+        rank[np.argsort(first)] = np.arange(len(labels))
+        comp = rank[inverse]
+        members = self.ids[np.argsort(comp, kind='stable')].tolist()
+        ends = np.cumsum(np.bincount(comp)).tolist()
+        return [members[start:end] for start, end in zip([0] + ends, ends)]
+
+    """Return the strongly connected component of a node, the nodes both reachable from it
+       and reaching it, found by a breadth first search over the matrix and one over its transpose
+       @return a list of the nodes' ids in the graph's order, or an empty list if the node doesn't exist"""
+
+    def component(self, id1: int) -> list:
+        row = self.snapshot.row_of(id1)
+        if row is None:
+            return list()
+        if self.reverse is None:
+            self.reverse = self.matrix.transpose().tocsr()
+        reached = np.zeros(len(self.ids), dtype=bool)
+        reached[csgraph.breadth_first_order(self.matrix, row, directed=True, return_predecessors=False)] = True
+        both = np.zeros(len(self.ids), dtype=bool)
+        both[csgraph.breadth_first_order(self.reverse, row, directed=True, return_predecessors=False)] = True
+        both &= reached
+        return self.ids[np.flatnonzero(both)].tolist()
+
+    """Calculate the distances from every source to every target with Dijkstra's algorithm
+       @param sources: a list of the source node ids
+       @param targets: a list of the target node ids
+       @return a NumPy array [len(sources), len(targets)], float('inf') where there is no path
+               or the node doesn't exist"""
+
+    def distances(self, sources: list, targets: list) -> np.ndarray:
+        src_rows = np.array([self._row(s) for s in sources], dtype=np.int64)
+        dest_rows = np.array([self._row(t) for t in targets], dtype=np.int64)
+        matrix = np.full((len(sources), len(targets)), np.inf)
+        found_src = np.flatnonzero(src_rows >= 0)
+        found_dest = np.flatnonzero(dest_rows >= 0)
+        if len(found_src) == 0 or len(found_dest) == 0:
+            return matrix
+
+        block = max(1, BLOCK_SIZE // max(1, len(self.ids)))
+        for start in range(0, len(found_src), block):
+            rows = found_src[start:start + block]
+            dist = csgraph.dijkstra(self.matrix, directed=True, indices=src_rows[rows])
+            matrix[np.ix_(rows, found_dest)] = dist[:, dest_rows[found_dest]]
+        return matrix
+
+    def _row(self, key) -> int:
+        row = self.snapshot.row_of(key)
+        return -1 if row is None else row
@@ -0,0 +1,67 @@
+import unittest
+import numpy as np
+from DiGraph import DiGraph
+from GraphAlgo import GraphAlgo
+
+
+class MyTestCase(unittest.TestCase):
+
+    def test_same_results(self):
+        for file in ['../data/A5', '../data/G_100_800_1.json', '../data/T0.json']:
+            ga = GraphAlgo()
+            ga.load_from_json(file)
+            sparse_ga = GraphAlgo(ga.get_graph(), backend="numpy")
+            self.assertEqual(sparse_ga.connected_components(), ga.connected_components())
+            keys = list(ga.get_graph().get_all_v())
+            for key in keys:
+                self.assertEqual(sparse_ga.connected_component(key), ga.connected_component(key))
+            self.assertTrue(np.array_equal(sparse_ga.distance_matrix(), ga.distance_matrix(workers=1)))
+
+    def test_missing_nodes(self):
+        g = DiGraph()
+        for i in [3, 1, 7]:
+            g.add_node(i)
+        g.add_edge(3, 1, 2.5)
+        g.add_edge(1, 3, 1)
+        ga = GraphAlgo(g, backend="numpy")
+        self.assertEqual(ga.connected_components(), [[3, 1], [7]])
+        self.assertEqual(ga.connected_component(1), [3, 1])
+        self.assertEqual(ga.connected_component(2), [])
+        matrix = ga.distance_matrix([3, 2], [1, 7, 5])
+        self.assertEqual(matrix.tolist(), [[2.5, float('inf'), float('inf')], [float('inf')] * 3])
+        self.assertEqual(GraphAlgo(DiGraph(), backend="numpy").connected_components(), [])
+
+    def test_numpy_ids(self):
+        ga = GraphAlgo(backend="numpy")
+        ga.load_from_json('../data/A0')
+        ids = np.arange(ga.get_graph().v_size(), dtype=np.int64)
+        expected = ga.distance_matrix(ids.tolist(), ids.tolist())
+        self.assertTrue(np.isfinite(expected).all())
+        self.assertTrue(np.array_equal(ga.distance_matrix(ids, ids), expected))
+        for key in ids:
+            self.assertEqual(ga.connected_component(key), ga.connected_component(int(key)))
+        self.assertEqual(len(ga.connected_component(np.int64(0))), len(ids))
+
+    def test_changes(self):
+        g = DiGraph()
+        for i in range(3):
+            g.add_node(i)
+        g.add_edge(0, 1, 1)
+        ga = GraphAlgo(g, backend="numpy")
+        self.assertEqual(ga.distance_matrix([0], [1, 2]).tolist(), [[1, float('inf')]])
+        sparse = ga._sparse
+        self.assertEqual(ga.connected_component(0), [0])
+        self.assertIs(ga._sparse, sparse)
+        g.add_edge(1, 2, 2)
+        g.add_edge(2, 0, 1)
+        self.assertEqual(ga.connected_component(0), [0, 1, 2])
+        self.assertEqual(ga.distance_matrix([0], [1, 2]).tolist(), [[1, 3]])
+        self.assertIsNot(ga._sparse, sparse)
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            GraphAlgo(backend="cuda")
+
+
+if __name__ == '__main__':
+    unittest.main()